@@ -1,27 +1,28 @@
 """配置热更新模块 - 监听配置文件变化并自动重新加载"""
+import importlib.util
 import logging
 import threading
 from pathlib import Path
-from typing import Optional, Callable
-from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Callable
+
+if TYPE_CHECKING:
+    from watchdog.observers import Observer
 
 logger = logging.getLogger(__name__)
 
-# 尝试导入 watchdog，如果不可用则使用轮询方式
-try:
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-    WATCHDOG_AVAILABLE = True
-except ImportError:
-    WATCHDOG_AVAILABLE = False
-    # 创建虚拟基类
-    class FileSystemEventHandler:
-        pass
+# 文件事件合并窗口（秒）：编辑器保存时会产生多次写入/重命名事件，
+# 在最后一次事件之后等待这段时间再重新加载，避免读到写了一半的文件
+RELOAD_DEBOUNCE_SECONDS = 0.1
+
+# watchdog 只在真正启动热更新时才导入（导入约需 20ms），
+# 关闭热更新（CONFIG_HOT_RELOAD=false）时不会加载；不可用时使用轮询方式
+WATCHDOG_AVAILABLE = importlib.util.find_spec("watchdog") is not None
+if not WATCHDOG_AVAILABLE:
     logger.warning("watchdog not available, using polling mode for config hot reload")
 
 
-class ConfigFileHandler(FileSystemEventHandler):
-    """配置文件变化处理器"""
+class ConfigFileHandler:
+    """配置文件变化处理器（实现 watchdog 的事件处理接口）"""
     
     def __init__(self, config_path: str, reload_callback: Callable[[], None]):
         """
@@ -35,7 +36,8 @@ class ConfigFileHandler(FileSystemEventHandler):
         self.reload_callback = reload_callback
         self.last_modified = self._get_file_mtime()
         self._reload_lock = threading.Lock()
-        self._last_reload_time = None
+        self._timer_lock = threading.Lock()
+        self._pending_timer: Optional[threading.Timer] = None
         
     def _get_file_mtime(self) -> Optional[float]:
         """获取文件修改时间"""
@@ -50,12 +52,6 @@ class ConfigFileHandler(FileSystemEventHandler):
         if current_mtime is None:
             return False
         
-        # 防止频繁重新加载（至少间隔 1 秒）
-        if self._last_reload_time:
-            time_since_last_reload = datetime.now().timestamp() - self._last_reload_time
-            if time_since_last_reload < 1.0:
-                return False
-        
         if current_mtime != self.last_modified:
             self.last_modified = current_mtime
             return True
@@ -70,19 +66,50 @@ class ConfigFileHandler(FileSystemEventHandler):
             try:
                 logger.info(f"Configuration file changed, reloading: {self.config_path}")
                 self.reload_callback()
-                self._last_reload_time = datetime.now().timestamp()
                 logger.info("Configuration reloaded successfully")
             except Exception as e:
                 logger.error(f"Failed to reload configuration: {e}", exc_info=True)
     
+    def schedule_reload(self):
+        """在事件合并窗口结束后重新加载（窗口内的新事件会重新计时）"""
+        with self._timer_lock:
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(RELOAD_DEBOUNCE_SECONDS, self._reload_config)
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+    
+    def cancel_pending(self):
+        """取消尚未执行的重新加载"""
+        with self._timer_lock:
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+                self._pending_timer = None
+    
+    def _is_config_file(self, path) -> bool:
+        """只处理目标配置文件，忽略同目录下的其他文件"""
+        return bool(path) and Path(path).resolve() == self.config_path
+    
+    def dispatch(self, event):
+        """watchdog 事件入口：按事件类型分发，只处理修改、创建和移动事件"""
+        handler = getattr(self, f"on_{event.event_type}", None)
+        if handler is not None:
+            handler(event)
+    
     def on_modified(self, event):
         """文件修改事件处理"""
-        if event.is_directory:
-            return
-        
-        # 只处理目标配置文件
-        if Path(event.src_path).resolve() == self.config_path:
-            self._reload_config()
+        if not event.is_directory and self._is_config_file(event.src_path):
+            self.schedule_reload()
+    
+    def on_created(self, event):
+        """文件创建事件处理（部分编辑器先删除再重建文件）"""
+        if not event.is_directory and self._is_config_file(event.src_path):
+            self.schedule_reload()
+    
+    def on_moved(self, event):
+        """文件移动事件处理（编辑器通过临时文件重命名来原子保存）"""
+        if not event.is_directory and self._is_config_file(getattr(event, "dest_path", None)):
+            self.schedule_reload()
 
 
 class ConfigHotReloader:
@@ -100,7 +127,7 @@ class ConfigHotReloader:
         self.config_path = Path(config_path).resolve()
         self.reload_callback = reload_callback
         self.poll_interval = poll_interval
-        self.observer: Optional[Observer] = None
+        self.observer: Optional["Observer"] = None
         self.polling_thread: Optional[threading.Thread] = None
         self._running = False
         self._handler: Optional[ConfigFileHandler] = None
@@ -128,6 +155,8 @@ class ConfigHotReloader:
             return
 
         try:
+            from watchdog.observers import Observer
+
             self._handler = ConfigFileHandler(str(self.config_path), self.reload_callback)
             self.observer = Observer()
 
@@ -170,6 +199,9 @@ class ConfigHotReloader:
             except Exception as e:
                 logger.error(f"Error stopping observer: {e}")
         
+        if self._handler:
+            self._handler.cancel_pending()
+        
         if self.polling_thread:
             self.polling_thread.join(timeout=2)
         
@@ -91,6 +91,7 @@ class AppConfig(BaseModel):
     observability: ObservabilityConfig = Field(default_factory=ObservabilityConfig)
     retry_on_zero_output_tokens: bool = Field(default=True, description="Whether to retry requests when output tokens is 0")
     retry_on_zero_output_tokens_retries: int = Field(default=3, description="Maximum number of retries when output tokens is 0")
+    stream_text_coalesce_ms: int = Field(default=0, description="Merge consecutive streamed text deltas for up to this many milliseconds (0 disables)")
 
 
 class Config:
@@ -154,6 +155,13 @@ class Config:
             except ValueError:
                 pass
 
+        stream_text_coalesce_ms_str = os.getenv("STREAM_TEXT_COALESCE_MS", "")
+        if stream_text_coalesce_ms_str:
+            try:
+                self.app_config.stream_text_coalesce_ms = int(stream_text_coalesce_ms_str)
+            except ValueError:
+                pass
+
         return self.app_config
 
     def get_enabled_providers(self) -> List[ProviderConfig]:
@@ -1,13 +1,342 @@
 """OpenAI to Anthropic response conversion."""
-import uuid
-import json as json_module
+import asyncio
+import secrets
 import logging
-from typing import AsyncIterator, Dict, Any
+import re
+import time
+from dataclasses import dataclass, field as dataclass_field
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Union
 
 from ..utils.token_extractor import extract_tokens_from_usage
+from ..utils.sse import dumps_json, encode_sse_event, loads_json
 
 logger = logging.getLogger(__name__)
 
+# Text delta coalescing: buffered text is flushed once it reaches this many
+# characters, or once the coalescing window passed to to_anthropic_async expires.
+TEXT_COALESCE_MAX_CHARS = 256
+
+# Tools executed by the provider; streamed as server_tool_use blocks.
+_SERVER_TOOL_NAMES = frozenset({"web_search", "web_search_20250305"})
+
+# OpenAI finish_reason -> Anthropic stop_reason.
+_STOP_REASON_MAP = {
+    'stop': 'end_turn',
+    'tool_calls': 'tool_use',
+    'function_call': 'tool_use',
+    'length': 'max_tokens'
+}
+
+# Skeleton of the message carried by the streaming message_start event;
+# to_anthropic_async shallow-copies it and fills in the per-stream fields.
+_MESSAGE_START_TEMPLATE = {
+    "id": None,
+    "type": "message",
+    "role": "assistant",
+    "content": None,
+    "model": None,
+    "stop_reason": None,
+    "stop_sequence": None,
+    "usage": None
+}
+
+# Constant stream scaffolding, pre-encoded once for the serialized path.
+_PING_SSE = encode_sse_event({"type": "ping"})
+_MESSAGE_STOP_SSE = encode_sse_event({"type": "message_stop"})
+
+# Fixed-shape skeleton for non-streaming responses; to_anthropic shallow-copies
+# it and fills in the per-response fields. Key order matches the API output.
+_RESPONSE_TEMPLATE = {
+    "id": None,
+    "provider": None,
+    "type": "message",
+    "role": "assistant",
+    "content": None,
+    "model": None,
+    "stop_reason": None,
+    "stop_sequence": None,
+    "usage": None,
+    "context_management": None,
+    "container": None
+}
+
+
+def _dict_field(obj, name: str, default=None):
+    """Read a field from a raw dict chunk."""
+    return obj.get(name, default)
+
+
+def _obj_field(obj, name: str, default=None):
+    """Read a field from an SDK/Pydantic chunk object."""
+    return getattr(obj, name, default)
+
+
+@dataclass(slots=True)
+class _ToolCallState:
+    """Per-tool-call streaming state, keyed by the OpenAI tool call index."""
+    id: Optional[str] = None
+    name: Optional[str] = None
+    claude_index: Optional[int] = None
+    started: bool = False
+    # Incremental JSON structure tracking for the streamed arguments, only
+    # updated when debug logging is on. The fragments themselves are forwarded
+    # as they arrive and not retained.
+    depth: int = 0
+    in_string: bool = False
+    escape: bool = False
+    started_value: bool = False
+
+    def args_complete(self) -> bool:
+        """Return True once the arguments form a closed top-level JSON value."""
+        return self.started_value and self.depth <= 0 and not self.in_string
+
+
+# Characters that affect JSON nesting; everything else is skipped by the regex engine
+_JSON_STRUCTURAL_RE = re.compile(r'[{}\[\]"\\]')
+
+
+def _scan_json_fragment(state: _ToolCallState, fragment: str) -> None:
+    """Advance the brace/bracket depth and string state over a new fragment.
+
+    Only the new fragment is scanned, so tracking completeness of the streamed
+    arguments costs O(total length) instead of re-parsing the whole buffer.
+    """
+    escaped_pos = 0 if state.escape else -1
+    state.escape = False
+    for match in _JSON_STRUCTURAL_RE.finditer(fragment):
+        pos = match.start()
+        if pos == escaped_pos:
+            continue
+        char = fragment[pos]
+        if state.in_string:
+            if char == '\\':
+                escaped_pos = pos + 1
+            elif char == '"':
+                state.in_string = False
+        elif char == '"':
+            state.in_string = True
+            state.started_value = True
+        elif char == '{' or char == '[':
+            state.depth += 1
+            state.started_value = True
+        elif char == '}' or char == ']':
+            state.depth -= 1
+    if escaped_pos == len(fragment):
+        state.escape = True
+
+
+@dataclass(slots=True)
+class _TextCoalescer:
+    """Buffers consecutive text deltas so they can be sent as one event."""
+    window: float
+    max_chars: int = TEXT_COALESCE_MAX_CHARS
+    parts: List[str] = dataclass_field(default_factory=list)
+    size: int = 0
+    deadline: float = 0.0
+
+    def add(self, text: str) -> bool:
+        """Buffer text; return True once the buffer should be flushed."""
+        if not self.parts:
+            self.deadline = time.monotonic() + self.window
+        self.parts.append(text)
+        self.size += len(text)
+        return self.size >= self.max_chars
+
+    def take(self) -> str:
+        """Return the buffered text and reset the buffer."""
+        text = ''.join(self.parts)
+        self.parts.clear()
+        self.size = 0
+        return text
+
+
+# Upstream tool call indexes below this are kept in a list; anything else
+# (negative, huge or non-integer) goes to a dict so it cannot break the stream.
+MAX_DENSE_TOOL_CALL_INDEX = 128
+
+# Queue items produced by _read_ahead's reader task besides upstream chunks.
+_UPSTREAM_DONE = object()
+_FLUSH_TEXT = object()
+
+# Upstream chunks read ahead of the converter while text is being coalesced.
+READ_AHEAD_MAX_CHUNKS = 64
+
+
+@dataclass(slots=True)
+class _UpstreamError:
+    """Carries an exception raised by the upstream stream to the converter."""
+    error: Exception
+
+
+async def _read_ahead(upstream: Any, pending_text: _TextCoalescer) -> AsyncIterator[Any]:
+    """Yield upstream chunks, or _FLUSH_TEXT when buffered text is due.
+
+    One reader task pulls chunks into a bounded queue, so the converter can
+    tell whether the next chunk has already arrived without starting a task
+    per chunk. A timer only runs while text is buffered and the queue is
+    empty, i.e. when the upstream is actually stalled.
+    """
+    queue: asyncio.Queue = asyncio.Queue(READ_AHEAD_MAX_CHUNKS)
+
+    async def pump() -> None:
+        try:
+            async for chunk in upstream:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(_UpstreamError(e))
+        else:
+            await queue.put(_UPSTREAM_DONE)
+
+    reader = asyncio.ensure_future(pump())
+    try:
+        while True:
+            if pending_text.parts and queue.empty():
+                item = _FLUSH_TEXT
+                timeout = pending_text.deadline - time.monotonic()
+                if timeout > 0:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            else:
+                item = await queue.get()
+
+            if item is _UPSTREAM_DONE:
+                return
+            if isinstance(item, _UpstreamError):
+                raise item.error
+            yield item
+    finally:
+        reader.cancel()
+        # wait() does not re-raise the reader's CancelledError, but still
+        # propagates a cancellation of the task running this generator.
+        await asyncio.wait((reader,))
+        aclose = getattr(upstream, 'aclose', None)
+        if aclose is not None:
+            await aclose()
+
+
+def _passthrough(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the event unchanged (used when the caller serializes events itself)."""
+    return event
+
+
+def _first_field(obj: Any, getter: Callable[..., Any], names: tuple) -> Any:
+    """Return the first truthy field among ``names`` read with ``getter``."""
+    for name in names:
+        value = getter(obj, name)
+        if value:
+            return value
+    return None
+
+
+def _reasoning_details_text(reasoning_details: Any) -> Optional[str]:
+    """Join the text parts of an OpenRouter-style ``reasoning_details`` list."""
+    if not reasoning_details or not isinstance(reasoning_details, list):
+        return None
+    reasoning_parts = []
+    for detail in reasoning_details:
+        if isinstance(detail, dict) and detail.get('text'):
+            reasoning_parts.append(detail.get('text'))
+        elif hasattr(detail, 'text') and detail.text:
+            reasoning_parts.append(str(detail.text))
+    return ''.join(reasoning_parts) or None
+
+
+def _text_delta(index: int, text: str) -> Dict[str, Any]:
+    """Build a text_delta content_block_delta event."""
+    return {"type": "content_block_delta", "index": index, "delta": {"type": "text_delta", "text": text}}
+
+
+def _thinking_delta(index: int, thinking: str) -> Dict[str, Any]:
+    """Build a thinking_delta content_block_delta event."""
+    return {"type": "content_block_delta", "index": index, "delta": {"type": "thinking_delta", "thinking": thinking}}
+
+
+def _signature_delta(index: int, signature: str) -> Dict[str, Any]:
+    """Build a signature_delta content_block_delta event."""
+    return {"type": "content_block_delta", "index": index, "delta": {"type": "signature_delta", "signature": signature}}
+
+
+def _input_json_delta(index: int, partial_json: str) -> Dict[str, Any]:
+    """Build an input_json_delta content_block_delta event."""
+    return {"type": "content_block_delta", "index": index, "delta": {"type": "input_json_delta", "partial_json": partial_json}}
+
+
+def _delta_frame_encoder(delta_type: str, key: str) -> Callable[[int, str], bytes]:
+    """Create an encoder that writes ``content_block_delta`` SSE frames directly.
+
+    The output matches ``encode_sse_event`` on the equivalent event dict, but
+    only the variable payload goes through the JSON encoder.
+    """
+    head = b'event: content_block_delta\ndata: {"type":"content_block_delta","index":'
+    middle = (',"delta":{"type":"%s","%s":' % (delta_type, key)).encode('utf-8')
+    tail = b'}}\n\n'
+
+    def encode(index: int, value: str) -> bytes:
+        return head + b'%d' % index + middle + dumps_json(value) + tail
+
+    return encode
+
+
+_DELTA_FRAME_TEXT = _delta_frame_encoder("text_delta", "text")
+_DELTA_FRAME_THINKING = _delta_frame_encoder("thinking_delta", "thinking")
+_DELTA_FRAME_INPUT_JSON = _delta_frame_encoder("input_json_delta", "partial_json")
+
+
+def _block_stop(index: int) -> Dict[str, Any]:
+    """Build a content_block_stop event."""
+    return {"type": "content_block_stop", "index": index}
+
+
+@lru_cache(maxsize=64)
+def _block_stop_sse(index: int) -> bytes:
+    """Encoded content_block_stop frame; block indices are small, so cache them."""
+    return encode_sse_event(_block_stop(index))
+
+
+# Field names under which providers stream reasoning text.
+_THINKING_FIELDS = ('thinking', 'reasoning', 'reasoning_content', 'thought')
+
+# Thinking tag pairs recognised in streamed text content, as
+# (start_tag, stop_tag, len(start_tag), len(stop_tag)).
+_THINKING_TAGS = tuple(
+    (start, stop, len(start), len(stop))
+    for start, stop in (
+        ("<thinking>", "</thinking>"),
+        ("<think>", "</think>"),
+        ("<reason>", "</reason>"),
+        ("<reasoning>", "</reasoning>"),
+        ("<thought>", "</thought>"),
+        ("<Thought>", "</Thought>"),
+        ("<|begin_of_thought|>", "<|end_of_thought|>"),
+        ("◁think▷", "◁/think▷"),
+        ("【Thinking】", "【/Thinking】"),
+    )
+)
+
+# Maps every start/stop tag to its pair; the regex finds any of them in one scan.
+_THINKING_TAG_PAIRS = {tag: pair for pair in _THINKING_TAGS for tag in pair[:2]}
+_THINKING_TAG_RE = re.compile("|".join(re.escape(tag) for tag in _THINKING_TAG_PAIRS))
+
+# Every proper prefix of a tag, used to hold back tags split across deltas.
+_THINKING_TAG_PREFIXES = frozenset(
+    tag[:i] for tag in _THINKING_TAG_PAIRS for i in range(1, len(tag))
+)
+
+
+def _split_partial_thinking_tag(text: str) -> tuple:
+    """Split ``text`` into the part safe to process and a trailing fragment
+    that could be the beginning of a thinking tag continued in the next delta.
+    """
+    # Lead characters only occur at the start of a tag, so a partial tag can
+    # only begin at the last one in the text.
+    lead = max(text.rfind('<'), text.rfind('◁'), text.rfind('【'))
+    if lead != -1 and text[lead:] in _THINKING_TAG_PREFIXES:
+        return text[:lead], text[lead:]
+    return text, ""
+
 
 def _handle_thinking_from_streaming_content(delta_content: str, reasoning_flag: bool) -> tuple:
     """Process thinking tags from content using unified state machine.
@@ -23,37 +352,31 @@ def _handle_thinking_from_streaming_content(delta_content: str, reasoning_flag:
     - ◁think▷/◁/think▷
     - 【Thinking】/【/Thinking】
     """
-    thinking_tags = [
-        ("<thinking>", "</thinking>"),
-        ("<think>", "</think>"),
-        ("<reason>", "</reason>"),
-        ("<reasoning>", "</reasoning>"),
-        ("<thought>", "</thought>"),
-        ("<Thought>", "</Thought>"),
-        ("<|begin_of_thought|>", "<|end_of_thought|>"),
-        ("◁think▷", "◁/think▷"),
-        ("【Thinking】", "【/Thinking】"),
-    ]
+    # Every tag starts with one of these characters; most deltas contain none.
+    if not reasoning_flag and '<' not in delta_content and '◁' not in delta_content and '【' not in delta_content:
+        return delta_content, None, False
 
     reasoning_content = ""
     content = ""
 
     matched_tags = None
-    for REASONING_START_TAG, REASONING_STOP_TAG in thinking_tags:
-        reasoning_start_tag_index = delta_content.find(REASONING_START_TAG)
-        reasoning_stop_tag_index = delta_content.find(REASONING_STOP_TAG)
-
-        if reasoning_start_tag_index != -1 or reasoning_stop_tag_index != -1:
-            matched_tags = (REASONING_START_TAG, REASONING_STOP_TAG, reasoning_start_tag_index, reasoning_stop_tag_index)
-            break
+    match = _THINKING_TAG_RE.search(delta_content)
+    if match:
+        REASONING_START_TAG, REASONING_STOP_TAG, start_tag_len, stop_tag_len = _THINKING_TAG_PAIRS[match.group()]
+        matched_tags = (
+            start_tag_len,
+            stop_tag_len,
+            delta_content.find(REASONING_START_TAG),
+            delta_content.find(REASONING_STOP_TAG)
+        )
 
     if not matched_tags and not reasoning_flag:
         return delta_content, None, False
 
     if matched_tags:
-        REASONING_START_TAG, REASONING_STOP_TAG, reasoning_start_tag_index, reasoning_stop_tag_index = matched_tags
+        start_tag_len, stop_tag_len, reasoning_start_tag_index, reasoning_stop_tag_index = matched_tags
     else:
-        REASONING_START_TAG, REASONING_STOP_TAG = thinking_tags[0]
+        start_tag_len, stop_tag_len = _THINKING_TAGS[0][2:]
         reasoning_start_tag_index = -1
         reasoning_stop_tag_index = -1
 
@@ -65,9 +388,9 @@ def _handle_thinking_from_streaming_content(delta_content: str, reasoning_flag:
                 # 内容在开始标签之前 -> 这部分应该是content，不是thinking
                 content += delta_content[:reasoning_start_tag_index]
                 # thinking内容在标签之间
-                reasoning_content += delta_content[reasoning_start_tag_index + len(REASONING_START_TAG):reasoning_stop_tag_index]
+                reasoning_content += delta_content[reasoning_start_tag_index + start_tag_len:reasoning_stop_tag_index]
 
-                remaining = delta_content[reasoning_stop_tag_index + len(REASONING_STOP_TAG):]
+                remaining = delta_content[reasoning_stop_tag_index + stop_tag_len:]
                 if remaining:
                     content += remaining
                 new_reasoning_flag = False
@@ -75,15 +398,15 @@ def _handle_thinking_from_streaming_content(delta_content: str, reasoning_flag:
                 # 结束标签在开始标签之前 -> 结束标签之前的内容应该是content
                 content += delta_content[:reasoning_stop_tag_index]
                 new_reasoning_flag = False
-                remaining = delta_content[reasoning_stop_tag_index + len(REASONING_STOP_TAG):]
+                remaining = delta_content[reasoning_stop_tag_index + stop_tag_len:]
                 if remaining:
                     content += remaining
         elif reasoning_start_tag_index != -1:
             if reasoning_start_tag_index == 0:
-                reasoning_content += delta_content[len(REASONING_START_TAG):]
+                reasoning_content += delta_content[start_tag_len:]
             else:
                 content += delta_content[:reasoning_start_tag_index]
-                reasoning_content += delta_content[reasoning_start_tag_index + len(REASONING_START_TAG):]
+                reasoning_content += delta_content[reasoning_start_tag_index + start_tag_len:]
         elif reasoning_stop_tag_index != -1:
             reasoning_part = delta_content[:reasoning_stop_tag_index]
             if reasoning_part.endswith('\n'):
@@ -91,7 +414,7 @@ def _handle_thinking_from_streaming_content(delta_content: str, reasoning_flag:
             if reasoning_part:
                 reasoning_content += reasoning_part
 
-            remaining = delta_content[reasoning_stop_tag_index + len(REASONING_STOP_TAG):]
+            remaining = delta_content[reasoning_stop_tag_index + stop_tag_len:]
             if remaining:
                 content += remaining
             new_reasoning_flag = False
@@ -106,6 +429,32 @@ def _handle_thinking_from_streaming_content(delta_content: str, reasoning_flag:
     return content, reasoning_content, new_reasoning_flag
 
 
+def _raise_invalid_response(openai_response: Dict[str, Any], reason: str) -> None:
+    """Raise ValueError for a response without usable choices.
+
+    Surfaces the upstream error payload when present, otherwise ``reason``.
+    """
+    error = openai_response.get('error', {})
+    if error:
+        error_msg = error.get('message', 'Unknown error')
+        error_type = error.get('type', 'api_error')
+        raise ValueError(f"OpenAI API error ({error_type}): {error_msg}")
+    raise ValueError(f"Invalid OpenAI response: {reason}")
+
+
+@lru_cache(maxsize=16)
+def _choice_dumper(choice_cls: type) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """Resolve the dict-conversion method for a choice class once per class.
+
+    SDK responses only ever use a couple of choice classes, so this turns the
+    per-response hasattr probing into a cached unbound-method lookup.
+    """
+    dumper = getattr(choice_cls, 'model_dump', None)
+    if dumper is None:
+        dumper = getattr(choice_cls, 'dict', None)
+    return dumper
+
+
 def to_anthropic(
     openai_response: Dict[str, Any],
     model: str
@@ -122,29 +471,18 @@ def to_anthropic(
     choices = openai_response.get('choices')
 
     if choices is None:
-        error = openai_response.get('error', {})
-        if error:
-            error_msg = error.get('message', 'Unknown error')
-            error_type = error.get('type', 'api_error')
-            raise ValueError(f"OpenAI API error ({error_type}): {error_msg}")
-        raise ValueError("Invalid OpenAI response: choices is None.")
+        _raise_invalid_response(openai_response, "choices is None.")
 
     if not isinstance(choices, list) or len(choices) == 0:
-        error = openai_response.get('error', {})
-        if error:
-            error_msg = error.get('message', 'Unknown error')
-            error_type = error.get('type', 'api_error')
-            raise ValueError(f"OpenAI API error ({error_type}): {error_msg}")
-        raise ValueError("Invalid OpenAI response: no choices in response.")
+        _raise_invalid_response(openai_response, "no choices in response.")
 
     choice = choices[0]
 
     # Handle both dict and Pydantic object - convert to dict
     if not isinstance(choice, dict):
-        if hasattr(choice, 'model_dump'):
-            choice = choice.model_dump()
-        elif hasattr(choice, 'dict'):
-            choice = choice.dict()
+        dumper = _choice_dumper(type(choice))
+        if dumper is not None:
+            choice = dumper(choice)
         elif hasattr(choice, '__dict__'):
             choice_dict = {
                 'message': {},
@@ -196,42 +534,39 @@ def to_anthropic(
     message = choice.get('message', {})
 
     # Build content blocks
-    content_blocks = []
-
-    if 'content' in message and message['content']:
-        content_blocks.append({
-            "type": "text",
-            "text": message['content'],
-            "citations": None
-        })
-
+    text = message.get('content')
     tool_calls = message.get('tool_calls')
-    if not tool_calls:
-        tool_calls = []
-    for tool_call in tool_calls:
-        if tool_call.get('type') == 'function':
-            func = tool_call.get('function', {})
-            try:
-                input_data = json_module.loads(func.get('arguments', '{}'))
-            except:
-                input_data = {}
 
+    if not tool_calls:
+        # Text-only responses are the common case: build the single block directly
+        content_blocks = [{"type": "text", "text": text, "citations": None}] if text else []
+    else:
+        content_blocks = []
+        if text:
             content_blocks.append({
-                "type": "tool_use",
-                "id": tool_call.get('id', ''),
-                "name": func.get('name', ''),
-                "input": input_data
+                "type": "text",
+                "text": text,
+                "citations": None
             })
 
+        for tool_call in tool_calls:
+            if tool_call.get('type') == 'function':
+                func = tool_call.get('function', {})
+                try:
+                    input_data = loads_json(func.get('arguments', '{}'))
+                except (TypeError, ValueError):
+                    input_data = {}
+
+                content_blocks.append({
+                    "type": "tool_use",
+                    "id": tool_call.get('id', ''),
+                    "name": func.get('name', ''),
+                    "input": input_data
+                })
+
     # Map finish_reason to stop_reason
     finish_reason = choice.get('finish_reason', 'stop')
-    stop_reason = None
-    if finish_reason == 'stop':
-        stop_reason = 'end_turn'
-    elif finish_reason == 'tool_calls':
-        stop_reason = 'tool_use'
-    elif finish_reason == 'length':
-        stop_reason = 'max_tokens'
+    stop_reason = _STOP_REASON_MAP.get(finish_reason)
 
     usage = openai_response.get('usage')
 
@@ -245,21 +580,15 @@ def to_anthropic(
     message_id = openai_response.get('id')
     provider = openai_response.get("provider")
 
-    response = {
-        "id": message_id,
-        "provider": provider,
-        "type": "message",
-        "role": "assistant",
-        "content": content_blocks if content_blocks else [{"type": "text", "text": ""}],
-        "model": model,
-        "stop_reason": stop_reason,
-        "stop_sequence": None,
-        "usage": {
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens
-        },
-        "context_management": None,
-        "container": None
+    response = _RESPONSE_TEMPLATE.copy()
+    response["id"] = message_id
+    response["provider"] = provider
+    response["content"] = content_blocks or [{"type": "text", "text": ""}]
+    response["model"] = model
+    response["stop_reason"] = stop_reason
+    response["usage"] = {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens
     }
 
     return response
@@ -268,14 +597,24 @@ def to_anthropic(
 async def to_anthropic_async(
     openai_stream: AsyncIterator,
     model: str,
-    initial_input_tokens: int = 0
-) -> AsyncIterator[Dict[str, Any]]:
+    initial_input_tokens: int = 0,
+    serialize: bool = False,
+    coalesce_window: float = 0.0
+) -> AsyncIterator[Union[Dict[str, Any], bytes]]:
     """Convert OpenAI streaming response to Anthropic streaming format.
 
     Args:
         openai_stream: Async iterator of OpenAI streaming chunks
         model: Model name
         initial_input_tokens: Initial input token count
+        serialize: When True, content block events are yielded as encoded SSE
+            frames (bytes). ``message_start``, ``message_metadata`` and
+            ``message_delta`` are still yielded as dicts so the caller can
+            inspect them.
+        coalesce_window: When > 0, consecutive text deltas are merged into a
+            single ``text_delta`` event. Buffered text is flushed after this
+            many seconds, after TEXT_COALESCE_MAX_CHARS characters, or before
+            any other content event. 0 forwards every upstream delta as is.
 
     Yields:
         Anthropic-format streaming chunks
@@ -284,10 +623,27 @@ async def to_anthropic_async(
         logger.error(f"openai_stream is None for model {model}")
         raise ValueError("openai_stream cannot be None")
 
-    message_id = f"msg_{uuid.uuid4().hex[:24]}"
+    emit = encode_sse_event if serialize else _passthrough
+    if serialize:
+        # Deltas are by far the most frequent events; write their frames
+        # directly instead of building a dict for emit() to encode. Block
+        # stops only vary by index and come from a cache of encoded frames.
+        text_delta = _DELTA_FRAME_TEXT
+        thinking_delta = _DELTA_FRAME_THINKING
+        input_json_delta = _DELTA_FRAME_INPUT_JSON
+        block_stop = _block_stop_sse
+    else:
+        text_delta = _text_delta
+        thinking_delta = _thinking_delta
+        input_json_delta = _input_json_delta
+        block_stop = _block_stop
+    message_id = "msg_" + secrets.token_hex(12)
     text_block_index = 0
     tool_block_counter = 0
-    current_tool_calls = {}
+    # Indexed by the upstream tool call index, which is normally small and
+    # dense; other indexes are kept in sparse_tool_calls.
+    current_tool_calls: List[Optional[_ToolCallState]] = []
+    sparse_tool_calls: Dict[Any, _ToolCallState] = {}
     text_block_started = False
     final_stop_reason = 'end_turn'
     finish_reason_seen = False
@@ -300,503 +656,348 @@ async def to_anthropic_async(
     thinking_stop_sent = False
     reasoning_flag = False
     previous_reasoning_flag = False
+    tag_carry = ""
     provider_extracted = None
     actual_provider = None
 
     # Send initial SSE events
-    yield {
-        "type": "message_start",
-        "message": {
-            "id": message_id,
-            "type": "message",
-            "role": "assistant",
-            "content": [],
-            "model": model,
-            "stop_reason": None,
-            "stop_sequence": None,
-            "usage": usage_data
-        }
-    }
+    start_message = _MESSAGE_START_TEMPLATE.copy()
+    start_message["id"] = message_id
+    start_message["content"] = []
+    start_message["model"] = model
+    start_message["usage"] = usage_data
+    yield {"type": "message_start", "message": start_message}
 
-    yield {"type": "ping"}
+    yield _PING_SSE if serialize else {"type": "ping"}
 
     has_content_chunks = False
     chunk_count = 0
     chunks_with_choices = 0
     chunks_without_choices = 0
 
-    async for chunk in openai_stream:
-        logger.debug(f"OpenAI streaming: {chunk}")
-        chunk_count += 1
-
-        # Extract message_id from OpenAI chunk if available
-        actual_message_id = None
-        if isinstance(chunk, dict):
-            actual_message_id = chunk.get("id")
-        elif hasattr(chunk, 'id'):
-            actual_message_id = getattr(chunk, 'id')
-
-        # Extract usage from chunk
-        chunk_usage = None
-        if hasattr(chunk, 'usage') and chunk.usage:
-            chunk_usage = chunk.usage
-        if not chunk_usage:
-            try:
-                if hasattr(chunk, 'model_dump'):
-                    chunk_dict = chunk.model_dump()
-                    chunk_usage = chunk_dict.get("usage")
-                elif hasattr(chunk, 'dict'):
-                    chunk_dict = chunk.dict()
-                    chunk_usage = chunk_dict.get("usage")
-                elif isinstance(chunk, dict):
-                    chunk_usage = chunk.get("usage")
-            except Exception:
-                pass
-
-        # Extract thinking signature
-        thinking_signature = None
-        if isinstance(chunk, dict):
-            thinking_signature = chunk.get("signature") or chunk.get("thinking_signature")
-        elif hasattr(chunk, 'signature'):
-            thinking_signature = getattr(chunk, 'signature', None)
-        elif hasattr(chunk, 'thinking_signature'):
-            thinking_signature = getattr(chunk, 'thinking_signature', None)
-
-        if thinking_signature and current_thinking_block is not None:
-            thinking_content_blocks[current_thinking_block]["signature"] = thinking_signature
-
-        # Update usage data using unified extractor
-        if chunk_usage:
-            # 使用统一的 token 提取工具
-            new_input, new_output = extract_tokens_from_usage(chunk_usage)
-
-            # 只在有新值时更新
-            if new_input is not None:
-                if isinstance(new_input, int) and new_input > 0 and new_input != usage_data["input_tokens"]:
-                    usage_data["input_tokens"] = new_input
-            if new_output is not None:
-                if isinstance(new_output, int) and new_output > usage_data["output_tokens"]:
-                    usage_data["output_tokens"] = new_output
-
-        # Extract provider info
-        if not provider_extracted:
-            if hasattr(chunk, "provider"):
-                actual_provider = chunk.provider
-            elif isinstance(chunk, dict):
-                actual_provider = chunk.get("provider")
-                if not actual_provider and "provider" in chunk:
-                    actual_provider = chunk["provider"]
-            elif hasattr(chunk, "model_dump"):
-                try:
-                    chunk_dict = chunk.model_dump()
-                    actual_provider = chunk_dict.get("provider")
-                except:
-                    pass
-
-            provider_extracted = True
-            yield {
-                "type": "message_metadata",
-                "actual_provider": actual_provider,
-                "actual_message_id": actual_message_id,
-            }
+    pending_text = _TextCoalescer(coalesce_window)
+    chunks = _read_ahead(openai_stream, pending_text) if coalesce_window else openai_stream
+
+    # Chunks within one stream share a shape (raw dicts or SDK objects), so the
+    # field accessor is picked once on the first chunk instead of re-probing
+    # hasattr/isinstance for every field of every chunk.
+    field = None
+    chunk_thinking_fields = ()
+    log_chunks = logger.isEnabledFor(logging.DEBUG)
+
+    try:
+        async for chunk in chunks:
+            if chunk is _FLUSH_TEXT:
+                # The coalescing window expired before the next upstream chunk
+                yield text_delta(text_block_index, pending_text.take())
+                continue
+
+            if log_chunks:
+                logger.debug("OpenAI streaming: %s", chunk)
+            chunk_count += 1
+
+            if field is None:
+                field = _dict_field if isinstance(chunk, dict) else _obj_field
+                # Raw payloads may carry reasoning under any alias at the top
+                # level; SDK chunks only ever expose ``thinking`` there.
+                chunk_thinking_fields = _THINKING_FIELDS if field is _dict_field else ('thinking',)
+
+            # Extract message_id from OpenAI chunk if available
+            actual_message_id = field(chunk, "id")
+
+            # Extract usage from chunk. SDK chunks expose usage (including provider
+            # extras) as attributes, so no model_dump() round-trip is needed.
+            chunk_usage = field(chunk, 'usage')
+
+            # Extract thinking signature; only meaningful once a thinking block exists
+            thinking_signature = None
+            if current_thinking_block is not None:
+                thinking_signature = field(chunk, 'signature') or field(chunk, 'thinking_signature')
+                if thinking_signature:
+                    thinking_content_blocks[current_thinking_block]["signature"] = thinking_signature
+
+            # Update usage data using unified extractor
+            if chunk_usage:
+                # 使用统一的 token 提取工具
+                new_input, new_output = extract_tokens_from_usage(chunk_usage)
+
+                # 只在有新值时更新
+                if new_input is not None:
+                    if isinstance(new_input, int) and new_input > 0 and new_input != usage_data["input_tokens"]:
+                        usage_data["input_tokens"] = new_input
+                if new_output is not None:
+                    if isinstance(new_output, int) and new_output > usage_data["output_tokens"]:
+                        usage_data["output_tokens"] = new_output
+
+            # Extract provider info. SDK chunks keep provider extras as attributes,
+            # so a model_dump() would not find anything getattr misses.
+            if not provider_extracted:
+                actual_provider = field(chunk, 'provider')
+                provider_extracted = True
+                yield {
+                    "type": "message_metadata",
+                    "actual_provider": actual_provider,
+                    "actual_message_id": actual_message_id,
+                }
+
+            choices = field(chunk, 'choices')
+
+            if not choices:
+                chunks_without_choices += 1
+
+                if pending_text.parts:
+                    yield text_delta(text_block_index, pending_text.take())
+
+                # Check for thinking content
+                thinking_content = _first_field(chunk, field, chunk_thinking_fields)
+
+                if thinking_content:
+                    has_content_chunks = True
+                    if current_thinking_block is None:
+                        current_thinking_block = text_block_index + 1
+                        thinking_content_blocks[current_thinking_block] = {
+                            "thinking": "",
+                            "signature": None
+                        }
+                        yield emit({
+                            "type": "content_block_start",
+                            "index": current_thinking_block,
+                            "content_block": {
+                                "type": "thinking",
+                                "thinking": ""
+                            }
+                        })
+
+                    if isinstance(thinking_content, str):
+                        thinking_content_blocks[current_thinking_block]["thinking"] += thinking_content
+                        yield thinking_delta(current_thinking_block, thinking_content)
+                    continue
+
+                # Check for signature
+                if thinking_signature:
+                    continue
+
+                # Check for direct content
+                if field is _dict_field:
+                    direct_content = chunk.get('content') or chunk.get('text')
+                    if direct_content:
+                        has_content_chunks = True
+                        yield text_delta(text_block_index, direct_content)
+                continue
+
+            chunks_with_choices += 1
+
+            if not choices or len(choices) == 0:
+                continue
 
-        choices = None
-        if hasattr(chunk, 'choices'):
-            choices = chunk.choices
-        elif isinstance(chunk, dict):
-            choices = chunk.get('choices')
-        elif hasattr(chunk, 'model_dump'):
-            try:
-                chunk_dict = chunk.model_dump()
-                choices = chunk_dict.get('choices')
-            except:
-                pass
-
-        if not choices:
-            chunks_without_choices += 1
-
-            # Check for thinking content
-            thinking_content = None
-            if hasattr(chunk, 'thinking'):
-                thinking_content = chunk.thinking
-            elif isinstance(chunk, dict):
-                for attr in ['thinking', 'reasoning', 'reasoning_content', 'thought']:
-                    if attr in chunk:
-                        thinking_content = chunk[attr]
-                        break
+            choice = choices[0]
+            delta = field(choice, 'delta')
+
+            if delta is None:
+                delta = {}
+
+            finish_reason = field(choice, 'finish_reason')
+            delta_field = _dict_field if isinstance(delta, dict) else _obj_field
+
+            content = delta_field(delta, 'content')
+            if not content:
+                content = field(choice, 'content') or field(choice, 'text')
+
+            # Handle thinking content
+            thinking_content = (
+                _first_field(chunk, field, chunk_thinking_fields)
+                or _first_field(delta, delta_field, _THINKING_FIELDS)
+                or _reasoning_details_text(delta_field(delta, 'reasoning_details'))
+                or _first_field(choice, field, _THINKING_FIELDS)
+            )
+
+            if not thinking_content and (content or tag_carry):
+                # A tag may be split across deltas: prepend what was held back last
+                # time and hold back a trailing partial tag until more text arrives.
+                if tag_carry:
+                    content = tag_carry + (content or "")
+                    tag_carry = ""
+                if not finish_reason:
+                    content, tag_carry = _split_partial_thinking_tag(content)
+                # 保存旧的 reasoning_flag 状态
+                previous_reasoning_flag = reasoning_flag
+                if content:
+                    content, thinking_content, reasoning_flag = _handle_thinking_from_streaming_content(content, reasoning_flag)
+
+            # 如果 reasoning_flag 从 True 变为 False，说明遇到了结束标签
+            if previous_reasoning_flag is True and reasoning_flag is False:
+                thinking_finished = True
 
             if thinking_content:
                 has_content_chunks = True
+                if pending_text.parts:
+                    yield text_delta(text_block_index, pending_text.take())
+                # 只有在没有遇到 reasoning 结束标签的情况下才重置 thinking_finished
+                if not (previous_reasoning_flag is True and reasoning_flag is False):
+                    thinking_finished = False
                 if current_thinking_block is None:
-                    current_thinking_block = text_block_index + 1
+                    current_thinking_block = text_block_index
                     thinking_content_blocks[current_thinking_block] = {
                         "thinking": "",
                         "signature": None
                     }
-                    yield {
+                    yield emit({
                         "type": "content_block_start",
                         "index": current_thinking_block,
                         "content_block": {
                             "type": "thinking",
                             "thinking": ""
                         }
-                    }
+                    })
 
                 if isinstance(thinking_content, str):
                     thinking_content_blocks[current_thinking_block]["thinking"] += thinking_content
-                    yield {
-                        "type": "content_block_delta",
-                        "index": current_thinking_block,
-                        "delta": {
-                            "type": "thinking_delta",
-                            "thinking": thinking_content
-                        }
-                    }
-                continue
-
-            # Check for signature
-            signature = None
-            if hasattr(chunk, 'signature'):
-                signature = chunk.signature
-            elif isinstance(chunk, dict):
-                signature = chunk.get('signature') or chunk.get('thinking_signature')
+                    yield thinking_delta(current_thinking_block, thinking_content)
+            else:
+                if current_thinking_block is not None and not thinking_finished:
+                    thinking_finished = True
 
-            if signature and current_thinking_block is not None:
-                thinking_content_blocks[current_thinking_block]["signature"] = signature
-                continue
+            # Handle text content
+            if content is not None and content != "" and (current_thinking_block is None or thinking_finished):
+                has_content_chunks = True
 
-            # Check for direct content
-            if isinstance(chunk, dict):
-                direct_content = chunk.get('content') or chunk.get('text')
-                if direct_content:
-                    has_content_chunks = True
-                    yield {
-                        "type": "content_block_delta",
+                # If we have a thinking block that hasn't been stopped yet, stop it now
+                if current_thinking_block is not None and not thinking_stop_sent:
+                    # Send signature_delta before stopping the thinking block
+                    thinking_data = thinking_content_blocks.get(current_thinking_block, {})
+                    signature = thinking_data.get("signature")
+
+                    # If no signature provided, generate a pseudo-signature based on thinking content
+                    if not signature:
+                        import hashlib
+                        thinking_content = thinking_data.get("thinking", "")
+                        if thinking_content:
+                            signature_hash = hashlib.sha256(thinking_content.encode()).hexdigest()
+                            signature = signature_hash[:64]
+
+                    # Always send signature_delta (use empty string if no signature available)
+                    if signature is None:
+                        signature = ""
+                    yield emit(_signature_delta(current_thinking_block, signature))
+
+                    # Now send the thinking block stop
+                    yield block_stop(current_thinking_block)
+                    thinking_stop_sent = True
+                    text_block_index = current_thinking_block + 1
+
+                    # Start the text block
+                    yield emit({
+                        "type": "content_block_start",
                         "index": text_block_index,
-                        "delta": {
-                            "type": "text_delta",
-                            "text": direct_content
+                        "content_block": {
+                            "type": "text",
+                            "text": ""
                         }
-                    }
-                    continue
-            continue
-
-        chunks_with_choices += 1
-
-        if not choices or len(choices) == 0:
-            continue
-
-        choice = choices[0]
-        delta = None
-        if isinstance(choice, dict):
-            delta = choice.get('delta', {})
-        elif hasattr(choice, 'delta'):
-            delta = getattr(choice, 'delta', None)
-
-        if delta is None:
-            delta = {}
-
-        finish_reason = None
-        if isinstance(choice, dict):
-            finish_reason = choice.get('finish_reason')
-        elif hasattr(choice, 'finish_reason'):
-            finish_reason = getattr(choice, 'finish_reason', None)
-        elif hasattr(choice, 'model_dump'):
-            try:
-                choice_dict = choice.model_dump()
-                finish_reason = choice_dict.get('finish_reason')
-            except:
-                pass
-
-        def get_delta_attr(attr, default=None):
-            if isinstance(delta, dict):
-                return delta.get(attr, default)
-            elif hasattr(delta, attr):
-                return getattr(delta, attr)
-            return default
-
-        def get_choice_attr(attr, default=None):
-            if isinstance(choice, dict):
-                return choice.get(attr, default)
-            elif hasattr(choice, attr):
-                return getattr(choice, attr)
-            return default
-
-        content = get_delta_attr('content')
-        if not content:
-            content = get_choice_attr('content') or get_choice_attr('text')
-
-        # Handle thinking content
-        thinking_content = None
-        if hasattr(chunk, 'thinking'):
-            thinking_content = chunk.thinking
-        if not thinking_content and isinstance(chunk, dict):
-            for attr in ['thinking', 'reasoning', 'reasoning_content', 'thought']:
-                if attr in chunk:
-                    thinking_content = chunk[attr]
-                    break
-
-        if not thinking_content:
-            for attr in ['thinking', 'reasoning', 'reasoning_content', 'thought']:
-                thinking_content = get_delta_attr(attr)
-                if thinking_content:
-                    break
-
-        if not thinking_content:
-            reasoning_details = get_delta_attr('reasoning_details')
-            if reasoning_details and isinstance(reasoning_details, list):
-                reasoning_parts = []
-                for detail in reasoning_details:
-                    if isinstance(detail, dict) and detail.get('text'):
-                        reasoning_parts.append(detail.get('text'))
-                    elif hasattr(detail, 'text') and detail.text:
-                        reasoning_parts.append(str(detail.text))
-                if reasoning_parts:
-                    thinking_content = ''.join(reasoning_parts)
-
-        if not thinking_content:
-            for attr in ['thinking', 'reasoning', 'reasoning_content', 'thought']:
-                thinking_content = get_choice_attr(attr)
-                if thinking_content:
-                    break
-
-        if not thinking_content and content:
-            # 保存旧的 reasoning_flag 状态
-            previous_reasoning_flag = reasoning_flag
-            content, thinking_content, reasoning_flag = _handle_thinking_from_streaming_content(content, reasoning_flag)
-
-        # 如果 reasoning_flag 从 True 变为 False，说明遇到了结束标签
-        if previous_reasoning_flag is True and reasoning_flag is False:
-            thinking_finished = True
-
-        if thinking_content:
-            has_content_chunks = True
-            # 只有在没有遇到 reasoning 结束标签的情况下才重置 thinking_finished
-            if not (previous_reasoning_flag is True and reasoning_flag is False):
-                thinking_finished = False
-            if current_thinking_block is None:
-                current_thinking_block = text_block_index
-                thinking_content_blocks[current_thinking_block] = {
-                    "thinking": "",
-                    "signature": None
-                }
-                yield {
-                    "type": "content_block_start",
-                    "index": current_thinking_block,
-                    "content_block": {
-                        "type": "thinking",
-                        "thinking": ""
-                    }
-                }
-
-            if isinstance(thinking_content, str):
-                thinking_content_blocks[current_thinking_block]["thinking"] += thinking_content
-                yield {
-                    "type": "content_block_delta",
-                    "index": current_thinking_block,
-                    "delta": {
-                        "type": "thinking_delta",
-                        "thinking": thinking_content
-                    }
-                }
-        else:
-            if current_thinking_block is not None and not thinking_finished:
-                thinking_finished = True
-
-        # Handle text content
-        if content is not None and content != "" and (current_thinking_block is None or thinking_finished):
-            has_content_chunks = True
-
-            # If we have a thinking block that hasn't been stopped yet, stop it now
-            if current_thinking_block is not None and not thinking_stop_sent:
-                # Send signature_delta before stopping the thinking block
-                thinking_data = thinking_content_blocks.get(current_thinking_block, {})
-                signature = thinking_data.get("signature")
-
-                # If no signature provided, generate a pseudo-signature based on thinking content
-                if not signature:
-                    import hashlib
-                    thinking_content = thinking_data.get("thinking", "")
-                    if thinking_content:
-                        signature_hash = hashlib.sha256(thinking_content.encode()).hexdigest()
-                        signature = signature_hash[:64]
-
-                # Always send signature_delta (use empty string if no signature available)
-                if signature is None:
-                    signature = ""
-                yield {
-                    "type": "content_block_delta",
-                    "index": current_thinking_block,
-                    "delta": {
-                        "type": "signature_delta",
-                        "signature": signature
-                    }
-                }
-
-                # Now send the thinking block stop
-                yield {
-                    "type": "content_block_stop",
-                    "index": current_thinking_block
-                }
-                thinking_stop_sent = True
-                text_block_index = current_thinking_block + 1
-
-                # Start the text block
-                yield {
-                    "type": "content_block_start",
-                    "index": text_block_index,
-                    "content_block": {
-                        "type": "text",
-                        "text": ""
-                    }
-                }
-                text_block_started = True
-            elif not text_block_started:
-                text_block_index = 0
-                yield {
-                    "type": "content_block_start",
-                    "index": text_block_index,
-                    "content_block": {
-                        "type": "text",
-                        "text": ""
-                    }
-                }
-                text_block_started = True
-
-            yield {
-                "type": "content_block_delta",
-                "index": text_block_index,
-                "delta": {
-                    "type": "text_delta",
-                    "text": content
-                }
-            }
-
-        # Handle tool calls
-        tool_calls = get_delta_attr('tool_calls')
-        if tool_calls:
-            for tc_delta in tool_calls:
-                def get_tc_attr(attr, default=None):
-                    if hasattr(tc_delta, attr):
-                        return getattr(tc_delta, attr)
-                    elif isinstance(tc_delta, dict):
-                        return tc_delta.get(attr, default)
-                    return default
-
-                tc_index = get_tc_attr('index', 0)
-
-                if tc_index not in current_tool_calls:
-                    current_tool_calls[tc_index] = {
-                        "id": None,
-                        "name": None,
-                        "args_buffer": [],
-                        "args_str": "",
-                        "json_sent": False,
-                        "claude_index": None,
-                        "started": False
-                    }
-
-                tool_call = current_tool_calls[tc_index]
-
-                tool_call_id = get_tc_attr('id')
-                if tool_call_id:
-                    tool_call["id"] = tool_call_id
-
-                func = get_tc_attr('function')
-                if func:
-                    if hasattr(func, 'name'):
-                        func_name = getattr(func, 'name', None)
-                    elif isinstance(func, dict):
-                        func_name = func.get('name')
-                    else:
-                        func_name = None
-
-                    if func_name:
-                        tool_call["name"] = func_name
-
-                tools_ready = (
-                    (current_thinking_block is None or thinking_finished) and
-                    (not text_block_started or thinking_finished)
-                )
-
-                if tool_call["id"] and tool_call["name"] and not tool_call["started"] and tools_ready:
-                    has_content_chunks = True
-                    tool_block_counter += 1
-                    claude_index = max(text_block_index + 1, current_thinking_block + 1 if current_thinking_block else 1) + tool_block_counter - 1
-                    tool_call["claude_index"] = claude_index
-                    tool_call["started"] = True
-
-                    tool_name = tool_call["name"]
-                    is_server_tool = tool_name in ["web_search", "web_search_20250305"]
-
-                    yield {
+                    })
+                    text_block_started = True
+                elif not text_block_started:
+                    text_block_index = 0
+                    yield emit({
                         "type": "content_block_start",
-                        "index": claude_index,
+                        "index": text_block_index,
                         "content_block": {
-                            "type": "server_tool_use" if is_server_tool else "tool_use",
-                            "id": tool_call["id"],
-                            "name": tool_call["name"],
-                            "input": {}
+                            "type": "text",
+                            "text": ""
                         }
-                    }
-
-                if func and tool_call["started"]:
-                    if hasattr(func, 'arguments'):
-                        arguments = getattr(func, 'arguments') or ''
-                    elif isinstance(func, dict):
-                        arguments = func.get('arguments') or ''
+                    })
+                    text_block_started = True
+
+                if not coalesce_window:
+                    yield text_delta(text_block_index, content)
+                elif pending_text.add(content):
+                    yield text_delta(text_block_index, pending_text.take())
+
+            # Handle tool calls
+            tool_calls = delta_field(delta, 'tool_calls')
+            if tool_calls:
+                # Tool call deltas and their function objects share the delta's
+                # shape (all dicts or all SDK objects), so delta_field reads them.
+                if pending_text.parts:
+                    yield text_delta(text_block_index, pending_text.take())
+                for tc_delta in tool_calls:
+                    tc_index = delta_field(tc_delta, 'index') or 0
+
+                    if type(tc_index) is int and 0 <= tc_index < MAX_DENSE_TOOL_CALL_INDEX:
+                        if tc_index >= len(current_tool_calls):
+                            current_tool_calls.extend([None] * (tc_index + 1 - len(current_tool_calls)))
+                        tool_call = current_tool_calls[tc_index]
+                        if tool_call is None:
+                            tool_call = current_tool_calls[tc_index] = _ToolCallState()
                     else:
-                        arguments = ''
-
-                    if arguments:
-                        tool_call["args_buffer"].append(arguments)
-                        buffer_len = sum(len(s) for s in tool_call["args_buffer"])
-
-                        should_try_parse = (
-                            not tool_call["json_sent"] and
-                            buffer_len > 10 and
-                            (buffer_len % 50 == 0 or arguments.rstrip().endswith('}'))
-                        )
-
-                        if should_try_parse:
-                            buffer_str = ''.join(tool_call["args_buffer"])
-                            try:
-                                json_module.loads(buffer_str)
-                                yield {
-                                    "type": "content_block_delta",
-                                    "index": tool_call["claude_index"],
-                                    "delta": {
-                                        "type": "input_json_delta",
-                                        "partial_json": buffer_str
-                                    }
-                                }
-                                tool_call["json_sent"] = True
-                                tool_call["args_str"] = buffer_str
-                            except json_module.JSONDecodeError:
-                                pass
-
-        if finish_reason:
-            stop_reason = None
-            if finish_reason == 'stop':
-                stop_reason = 'end_turn'
-            elif finish_reason in ['tool_calls', 'function_call']:
-                stop_reason = 'tool_use'
-            elif finish_reason == 'length':
-                stop_reason = 'max_tokens'
-            else:
-                stop_reason = 'end_turn'
-
-            final_stop_reason = stop_reason
-            finish_reason_seen = True
+                        tool_call = sparse_tool_calls.get(tc_index)
+                        if tool_call is None:
+                            tool_call = sparse_tool_calls[tc_index] = _ToolCallState()
+
+                    tool_call_id = delta_field(tc_delta, 'id')
+                    if tool_call_id:
+                        tool_call.id = tool_call_id
+
+                    func = delta_field(tc_delta, 'function')
+                    if func:
+                        func_name = delta_field(func, 'name')
+                        if func_name:
+                            tool_call.name = func_name
+
+                    tools_ready = (
+                        (current_thinking_block is None or thinking_finished) and
+                        (not text_block_started or thinking_finished)
+                    )
+
+                    if tool_call.id and tool_call.name and not tool_call.started and tools_ready:
+                        has_content_chunks = True
+                        tool_block_counter += 1
+                        claude_index = max(text_block_index + 1, current_thinking_block + 1 if current_thinking_block else 1) + tool_block_counter - 1
+                        tool_call.claude_index = claude_index
+                        tool_call.started = True
+
+                        yield emit({
+                            "type": "content_block_start",
+                            "index": claude_index,
+                            "content_block": {
+                                "type": "server_tool_use" if tool_call.name in _SERVER_TOOL_NAMES else "tool_use",
+                                "id": tool_call.id,
+                                "name": tool_call.name,
+                                "input": {}
+                            }
+                        })
+
+                    if func and tool_call.started:
+                        arguments = delta_field(func, 'arguments') or ''
+
+                        if arguments:
+                            # Forward each fragment as partial_json right away, like the
+                            # Anthropic API does; clients concatenate the fragments.
+                            # Completeness is only tracked for the debug log at the end.
+                            if log_chunks:
+                                _scan_json_fragment(tool_call, arguments)
+                            yield input_json_delta(tool_call.claude_index, arguments)
+
+            if finish_reason:
+                final_stop_reason = _STOP_REASON_MAP.get(finish_reason, 'end_turn')
+                finish_reason_seen = True
+    finally:
+        if chunks is not openai_stream:
+            # Stop the read-ahead task and release the upstream response
+            # even when the client disconnected mid-stream.
+            await chunks.aclose()
+
+    if pending_text.parts:
+        yield text_delta(text_block_index, pending_text.take())
+
+    # Text held back as a possible partial tag when the stream ended without a
+    # finish_reason chunk; it was not a tag after all.
+    if tag_carry and reasoning_flag and current_thinking_block is not None and not thinking_stop_sent:
+        thinking_content_blocks[current_thinking_block]["thinking"] += tag_carry
+        yield thinking_delta(current_thinking_block, tag_carry)
+        tag_carry = ""
 
     if not finish_reason_seen:
-        logger.debug(f"OpenAI stream ended naturally without finish_reason. Model: {model}")
-
-    if not has_content_chunks:
-        logger.warning(
-            f"OpenAI stream conversion completed without any content chunks. "
-            f"Model: {model}, Total chunks: {chunk_count}"
-        )
+        logger.debug("OpenAI stream ended naturally without finish_reason. Model: %s", model)
 
     # Stop thinking block if not already stopped (handles case where there's only thinking, no text)
     if current_thinking_block is not None and not thinking_stop_sent:
@@ -812,56 +1013,47 @@ async def to_anthropic_async(
             signature = signature_hash[:64]
 
         if signature:
-            yield {
-                "type": "content_block_delta",
-                "index": current_thinking_block,
-                "delta": {
-                    "type": "signature_delta",
-                    "signature": signature
+            yield emit(_signature_delta(current_thinking_block, signature))
+
+        yield block_stop(current_thinking_block)
+
+    # Held-back text that belongs to the answer; open a text block for it
+    # (after any thinking and tool blocks) if none was started.
+    if tag_carry:
+        has_content_chunks = True
+        if not text_block_started:
+            text_block_index = max(
+                (tool_data.claude_index for tool_data in (*current_tool_calls, *sparse_tool_calls.values())
+                 if tool_data is not None and tool_data.claude_index is not None),
+                default=-1 if current_thinking_block is None else current_thinking_block
+            ) + 1
+            yield emit({
+                "type": "content_block_start",
+                "index": text_block_index,
+                "content_block": {
+                    "type": "text",
+                    "text": ""
                 }
-            }
+            })
+            text_block_started = True
+        yield text_delta(text_block_index, tag_carry)
 
-        yield {
-            "type": "content_block_stop",
-            "index": current_thinking_block
-        }
+    if not has_content_chunks:
+        logger.warning(
+            "OpenAI stream conversion completed without any content chunks. "
+            "Model: %s, Total chunks: %d", model, chunk_count
+        )
 
     # Stop text block
     if text_block_started:
-        yield {
-            "type": "content_block_stop",
-            "index": text_block_index
-        }
+        yield block_stop(text_block_index)
 
     # Stop all tool blocks
-    for tool_data in current_tool_calls.values():
-        if tool_data.get("started") and tool_data.get("claude_index") is not None:
-            if tool_data["args_buffer"] and not tool_data["json_sent"]:
-                buffer_str = tool_data.get("args_str") or ''.join(tool_data["args_buffer"])
-                try:
-                    json_module.loads(buffer_str)
-                    yield {
-                        "type": "content_block_delta",
-                        "index": tool_data["claude_index"],
-                        "delta": {
-                            "type": "input_json_delta",
-                            "partial_json": buffer_str
-                        }
-                    }
-                except:
-                    yield {
-                        "type": "content_block_delta",
-                        "index": tool_data["claude_index"],
-                        "delta": {
-                            "type": "input_json_delta",
-                            "partial_json": buffer_str
-                        }
-                    }
-
-            yield {
-                "type": "content_block_stop",
-                "index": tool_data["claude_index"]
-            }
+    for tool_data in (*current_tool_calls, *sparse_tool_calls.values()):
+        if tool_data is not None and tool_data.started and tool_data.claude_index is not None:
+            if log_chunks and tool_data.started_value and not tool_data.args_complete():
+                logger.debug("Tool call %s arguments ended with incomplete JSON. Model: %s", tool_data.id, model)
+            yield block_stop(tool_data.claude_index)
 
     # Send message_delta
     yield {
@@ -874,4 +1066,4 @@ async def to_anthropic_async(
     }
 
     # Send message_stop
-    yield {"type": "message_stop"}
+    yield _MESSAGE_STOP_SSE if serialize else {"type": "message_stop"}
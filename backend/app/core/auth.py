@@ -4,11 +4,13 @@
 - 服务 API：API Key 验证
 - 开发模式：可通过环境变量 DEV_MODE=true 或 --dev 参数启用，开发模式下允许无 API Key 访问
 """
+import asyncio
 import os
 import secrets
 import hashlib
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status, Request, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -31,6 +33,7 @@ if not SECRET_KEY:
         "This key will change on restart. Set JWT_SECRET_KEY environment variable for production."
     )
 ALGORITHM = "HS256"
+_JWT_ALGORITHMS = [ALGORITHM]
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_TOKEN_EXPIRE_MINUTES", "1440"))  # 24 hours default
 
 # Development mode flag (set via environment variable or command line argument)
@@ -49,20 +52,44 @@ if _is_dev_mode_env and not DEV_MODE:
         "If you need to use DEV_MODE in production, set DEV_MODE_ALLOWED_IN_PRODUCTION=true "
         "(WARNING: This is a major security risk and not recommended!)"
     )
-
-
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+elif DEV_MODE:
+    logger.warning("DEV_MODE is enabled: all requests are accepted without authentication")
+
+# Identities returned by the auth dependencies in development mode
+_DEV_ADMIN_USER = {
+    "user_id": 1,  # Default to admin user ID 1
+    "email": "admin@example.com",
+    "name": "Administrator",
+    "is_admin": True,
+    "type": "dev"
+}
+_DEV_API_USER = {
+    "api_key_id": None,
+    "name": "dev-user",
+    "email": None,
+    "user_id": None,
+    "type": "dev"
+}
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password using bcrypt.
+
+    bcrypt is deliberately slow, so it runs in a worker thread to keep the
+    event loop free.
+    """
     # Generate salt and hash password
     salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+    hashed = await asyncio.to_thread(bcrypt.hashpw, password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash (in a worker thread, see hash_password)."""
     try:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return await asyncio.to_thread(
+            bcrypt.checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8')
+        )
     except Exception:
         return False
 
@@ -101,6 +128,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Tokens that passed verification, mapped to (cache expiry, user info). The
+# same bearer token is sent with every panel request, and entries never outlive
+# the token's own exp claim.
+JWT_CACHE_TTL = 300  # seconds
+JWT_CACHE_MAX_SIZE = 1024
+_verified_tokens: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
 def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Verify JWT token and return user info.
@@ -108,8 +143,14 @@ def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
     Returns:
         User info if valid, None otherwise
     """
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        if cached[0] > time.time():
+            return dict(cached[1])
+        del _verified_tokens[token]
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=_JWT_ALGORITHMS)
         user_id_str: str = payload.get("sub")
         is_admin: bool = payload.get("is_admin", False)
 
@@ -123,11 +164,19 @@ def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
             logger.warning(f"Invalid user_id in token: {user_id_str}")
             return None
 
-        return {
+        user_info = {
             "user_id": user_id,
             "is_admin": is_admin,
             "type": "jwt"
         }
+        cache_until = time.time() + JWT_CACHE_TTL
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            cache_until = min(cache_until, exp)
+        if len(_verified_tokens) >= JWT_CACHE_MAX_SIZE:
+            _verified_tokens.pop(next(iter(_verified_tokens)))
+        _verified_tokens[token] = (cache_until, user_info)
+        return dict(user_info)
     except JWTError as e:
         # Log more specific error information for debugging
         error_type = type(e).__name__
@@ -173,6 +222,23 @@ async def verify_api_key(api_key: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _extract_bearer_token(
+    credentials: Optional[HTTPAuthorizationCredentials],
+    request: Optional[Request]
+) -> Optional[str]:
+    """
+    Get the bearer token from HTTPBearer credentials, falling back to the raw
+    Authorization header when the caller did not go through HTTPBearer.
+    """
+    if credentials:
+        return credentials.credentials
+    if request:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            return auth_header[7:]
+    return None
+
+
 async def get_current_admin_user(
     credentials: Optional[HTTPAuthorizationCredentials] = None,
     request: Optional[Request] = None
@@ -188,18 +254,12 @@ async def get_current_admin_user(
     """
     # Development mode: allow access without validation
     if DEV_MODE:
-        logger.info("Development mode: Allowing admin access without authentication")
-        return {
-            "user_id": 1,  # Default to admin user ID 1
-            "email": "admin@example.com",
-            "name": "Administrator",
-            "is_admin": True,
-            "type": "dev"
-        }
+        logger.debug("Development mode: Allowing admin access without authentication")
+        return dict(_DEV_ADMIN_USER)
 
     # Try Bearer token (JWT)
-    if credentials:
-        token = credentials.credentials
+    token = _extract_bearer_token(credentials, request)
+    if token:
         user = verify_jwt_token(token)
         if user:
             # Verify user is admin and active
@@ -216,29 +276,8 @@ async def get_current_admin_user(
         else:
             logger.warning("JWT token verification failed")
     elif request:
-        # Check if Authorization header exists but wasn't parsed by HTTPBearer
-        auth_header = request.headers.get("Authorization")
-        if auth_header:
-            # Try to extract token manually
-            if auth_header.startswith("Bearer "):
-                token = auth_header[7:]
-                user = verify_jwt_token(token)
-                if user:
-                    db = get_database()
-                    user_data = await db.get_user_by_id(user["user_id"])
-                    if user_data and user_data.get("is_active") and user_data.get("is_admin"):
-                        logger.info("Successfully authenticated using manual token extraction")
-                        return {
-                            "user_id": user_data["id"],
-                            "email": user_data["email"],
-                            "name": user_data["name"],
-                            "is_admin": True,
-                            "type": "jwt"
-                        }
-                else:
-                    logger.warning("Manual token extraction failed")
-            else:
-                logger.warning("Authorization header has invalid format")
+        if request.headers.get("Authorization"):
+            logger.warning("Authorization header has invalid format")
         else:
             logger.warning("No Authorization header found in request")
     
@@ -288,14 +327,8 @@ async def get_current_api_user(
     """
     # Development mode: allow access without validation
     if DEV_MODE:
-        logger.info("Development mode: Allowing access without API key validation")
-        return {
-            "api_key_id": None,
-            "name": "dev-user",
-            "email": None,
-            "user_id": None,
-            "type": "dev"
-        }
+        logger.debug("Development mode: Allowing access without API key validation")
+        return dict(_DEV_API_USER)
 
     # Production mode: require valid API key or JWT token
     # Try API key from header first
@@ -401,18 +434,12 @@ async def get_current_user(
     """
     # Development mode: allow access without validation
     if DEV_MODE:
-        logger.info("Development mode: Allowing user access without authentication")
-        return {
-            "user_id": 1,
-            "email": "admin@example.com",
-            "name": "Administrator",
-            "is_admin": True,
-            "type": "dev"
-        }
+        logger.debug("Development mode: Allowing user access without authentication")
+        return dict(_DEV_ADMIN_USER)
 
     # Try Bearer token (JWT)
-    if credentials:
-        token = credentials.credentials
+    token = _extract_bearer_token(credentials, request)
+    if token:
         user = verify_jwt_token(token)
         if user:
             # Verify user is active
@@ -430,27 +457,6 @@ async def get_current_user(
         else:
             logger.warning("JWT token verification failed")
 
-    # Check if Authorization header exists but wasn't parsed by HTTPBearer
-    if request:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header[7:]
-            user = verify_jwt_token(token)
-            if user:
-                db = get_database()
-                user_data = await db.get_user_by_id(user["user_id"])
-                if user_data and user_data.get("is_active"):
-                    logger.info(f"User authentication successful via manual token extraction for {user_data['email']}")
-                    return {
-                        "id": user_data["id"],
-                        "email": user_data["email"],
-                        "name": user_data.get("name"),
-                        "is_admin": user_data.get("is_admin", False),
-                        "type": "jwt"
-                    }
-            else:
-                logger.warning("Manual token extraction failed")
-
     # No valid authentication provided
     logger.warning("No valid authentication token provided")
     raise HTTPException(
@@ -489,7 +495,7 @@ def require_permission(permission: "PermissionCategory"):
     Returns:
         Dependency function that checks for the specified permission
     """
-    from .permissions import PermissionCategory, ADMIN_PERMISSIONS, DEFAULT_USER_PERMISSIONS
+    from .permissions import has_permission
     import json
     import logging
     from ..database import get_database
@@ -511,22 +517,21 @@ def require_permission(permission: "PermissionCategory"):
                 detail="User not found"
             )
 
-        # Get user permissions
+        # Get user permissions; without stored ones the role defaults apply
+        perms = None
         user_permissions = user.get("permissions")
         if user_permissions:
             try:
                 perms = json.loads(user_permissions)
-                # If permissions dict is empty, use defaults
-                if not perms:
-                    perms = DEFAULT_USER_PERMISSIONS.copy()
             except (json.JSONDecodeError, AttributeError):
-                perms = DEFAULT_USER_PERMISSIONS.copy()
-        else:
-            perms = DEFAULT_USER_PERMISSIONS.copy()
+                pass
 
         # Check if user has the required permission
-        has_permission = perms.get(permission, False)
-        if not has_permission:
+        if perms:
+            granted = perms.get(permission, False)
+        else:
+            granted = has_permission(False, permission)
+        if not granted:
             logging.warning(
                 f"Permission denied for user {user['email']}: "
                 f"requires {permission}"
@@ -1,22 +1,43 @@
 """Application lifecycle events (startup/shutdown)."""
+import asyncio
 import os
 import logging
 
-from ..config import config
-from ..infrastructure import get_cache_manager
-from ..database import get_database
-from .auth import hash_password
+from ..config import config, start_config_hot_reload, stop_config_hot_reload
+from ..infrastructure import get_cache_manager, close_cache
+from ..database import get_database, initialize_database, close_database
+from .auth import hash_password, verify_password
 
 logger = logging.getLogger(__name__)
 
+_TRUE_VALUES = frozenset(("true", "1", "yes"))
+
+
+def _env_bool(name: str, default: str) -> bool:
+    """Read a boolean flag from the environment."""
+    return os.getenv(name, default).lower() in _TRUE_VALUES
+
+
+# Environment settings are only read at startup - changes require a restart
+_HOT_RELOAD_ENABLED = _env_bool("CONFIG_HOT_RELOAD", "true")
+_ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@example.com")
+
 
 async def init_default_admin():
     """Initialize default admin user if not exists."""
     db = get_database()
     
     # Check if any admin user exists
-    admin_email = os.getenv("ADMIN_EMAIL", "admin@example.com")
-    admin_password = os.getenv("ADMIN_PASSWORD", "admin123")
+    admin_email = _ADMIN_EMAIL
+    existing_user = await db.get_user_by_email(admin_email)
+    if existing_user:
+        logger.info(f"Admin user already exists: {admin_email}")
+        return
+    
+    # Read only on the path that creates the admin, so the bootstrap
+    # password is not kept in a module global for the life of the process
+    env_password = os.getenv("ADMIN_PASSWORD")
+    admin_password = env_password if env_password is not None else "admin123"
     
     # Require strong password in production
     if not admin_password:
@@ -32,13 +53,13 @@ async def init_default_admin():
             "Consider using a stronger password in production."
         )
     
-    existing_user = await db.get_user_by_email(admin_email)
-    if existing_user:
-        logger.info(f"Admin user already exists: {admin_email}")
-        return
-    
     # Create default admin user
-    password_hash = hash_password(admin_password)
+    password_hash = await hash_password(admin_password)
+    # One-off self-check of the hashing backend before the admin account
+    # depends on it (verify_password compares in constant time via bcrypt)
+    if not await verify_password(admin_password, password_hash):
+        logger.error("Password hash self-check failed; default admin user not created")
+        return
     user_id = await db.create_user(
         email=admin_email,
         password_hash=password_hash,
@@ -48,7 +69,7 @@ async def init_default_admin():
     
     if user_id:
         logger.info(f"Created default admin user: {admin_email}")
-        if not os.getenv("ADMIN_PASSWORD"):
+        if not env_password:
             # In production, use ADMIN_PASSWORD env var. Random password was generated for safety.
             logger.warning("No ADMIN_PASSWORD set. A random password was generated. Set ADMIN_PASSWORD environment variable before using in production!")
         else:
@@ -59,24 +80,20 @@ async def init_default_admin():
 
 async def startup_event():
     """Initialize cache on startup."""
-    # Initialize database
-    from ..database import initialize_database
-    await initialize_database()
-    logger.info("Database initialized successfully")
-    
+    # Database and cache are independent, so initialize them concurrently
     if config.app_config.cache.enabled:
         logger.info("Initializing cache system...")
-        cache_manager = get_cache_manager()
-        await cache_manager.initialize()
+        await asyncio.gather(initialize_database(), get_cache_manager().initialize())
         logger.info("Cache system initialized successfully")
+    else:
+        await initialize_database()
+    logger.info("Database initialized successfully")
     
     # Initialize default admin user if not exists
     await init_default_admin()
     
     # Start config hot reload
-    hot_reload_enabled = os.getenv("CONFIG_HOT_RELOAD", "true").lower() in ("true", "1", "yes")
-    if hot_reload_enabled:
-        from ..config import start_config_hot_reload
+    if _HOT_RELOAD_ENABLED:
         # Create reload callback that reloads config
         def reload_config():
             try:
@@ -88,7 +105,7 @@ async def startup_event():
         start_config_hot_reload(config.config_path, reload_config)
         logger.info("Configuration hot reload enabled")
     else:
-        logger.info("Configuration hot reload disabled (set CONFIG_HOT_RELOAD=false to disable)")
+        logger.info("Configuration hot reload disabled (CONFIG_HOT_RELOAD=false)")
 
 
 async def shutdown_event():
@@ -96,15 +113,12 @@ async def shutdown_event():
     logger.info("Shutting down and cleaning up resources...")
     
     # Stop config hot reload
-    from ..config import stop_config_hot_reload
     stop_config_hot_reload()
     
     # Close cache connections
-    from ..infrastructure import close_cache
     await close_cache()
     
     # Close database connections
-    from ..database import close_database
     await close_database()
     
     logger.info("Shutdown complete")
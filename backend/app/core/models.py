@@ -1,7 +1,7 @@
 """Data models for Anthropic API compatibility."""
 
-from typing import List, Optional, Union, Dict, Any, Literal
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Annotated, List, Optional, Union, Dict, Any, Literal
+from pydantic import BaseModel, Discriminator, Field, ConfigDict, Tag
 from enum import Enum
 
 
@@ -48,6 +48,8 @@ class TextDelta(BaseModel):
     type: Literal["text_delta"] = "text_delta"
     text: str
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ContentBlock(BaseModel):
     """Content block."""
@@ -61,11 +63,57 @@ class ContentBlock(BaseModel):
     model_config = {"extra": "allow"}  # Allow extra fields
 
 
+# ContentBlock fields that TextContent and ImageContent do not have. A block
+# carrying any of them may validate as either model, so it is left to the
+# plain union to decide.
+_TEXT_BLOCK_EXTRA_FIELDS = frozenset({"source", "name", "input", "id"})
+_IMAGE_BLOCK_EXTRA_FIELDS = frozenset({"text", "name", "input", "id"})
+
+
+def _content_item_tag(value: Any) -> str:
+    """Pick the model for a message content block from its type.
+
+    Plain text and image blocks, and blocks of any other type, go straight
+    to their model. Anything ambiguous (no type, a text block whose text is
+    not a string, extra ContentBlock fields) is validated by trying each
+    union member in turn, exactly as before.
+    """
+    if isinstance(value, dict):
+        block_type = value.get("type")
+        if block_type == "text":
+            if isinstance(value.get("text"), str) and _TEXT_BLOCK_EXTRA_FIELDS.isdisjoint(value):
+                return "text"
+        elif block_type == "image":
+            if value.get("source") is not None and _IMAGE_BLOCK_EXTRA_FIELDS.isdisjoint(value):
+                return "image"
+        elif block_type is not None:
+            return "block"
+        return "union"
+    if isinstance(value, TextContent):
+        return "text"
+    if isinstance(value, ImageContent):
+        return "image"
+    if isinstance(value, ContentBlock):
+        return "block"
+    return "union"
+
+
+ContentItem = Annotated[
+    Union[
+        Annotated[TextContent, Tag("text")],
+        Annotated[ImageContent, Tag("image")],
+        Annotated[ContentBlock, Tag("block")],
+        Annotated[Union[TextContent, ImageContent, ContentBlock], Tag("union")],
+    ],
+    Discriminator(_content_item_tag),
+]
+
+
 class Message(BaseModel):
     """Anthropic message."""
 
     role: MessageRole
-    content: Union[str, List[Union[TextContent, ImageContent, ContentBlock]]]
+    content: Union[str, List[ContentItem]]
 
 
 class ToolDefinition(BaseModel):
@@ -108,6 +156,8 @@ class TextBlock(BaseModel):
     text: str
     citations: Optional[Any] = None  # Optional citations field per Anthropic spec
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ToolUseBlock(BaseModel):
     """Tool use block in response."""
@@ -117,6 +167,8 @@ class ToolUseBlock(BaseModel):
     name: str
     input: Dict[str, Any]
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ToolResultBlock(BaseModel):
     """Tool result block."""
@@ -127,13 +179,16 @@ class ToolResultBlock(BaseModel):
     is_error: Optional[bool] = False
 
 
+ResponseContentBlock = Annotated[Union[TextBlock, ToolUseBlock], Field(discriminator="type")]
+
+
 class MessageResponse(BaseModel):
     """Anthropic message response."""
 
     id: str
     type: Literal["message"] = "message"
     role: Literal["assistant"] = "assistant"
-    content: List[Union[TextBlock, ToolUseBlock]]
+    content: List[ResponseContentBlock]
     model: str
     stop_reason: Optional[str] = None
     stop_sequence: Optional[str] = None
@@ -141,17 +196,21 @@ class MessageResponse(BaseModel):
     context_management: Optional[Dict[str, Any]] = None  # Optional per spec
     container: Optional[Dict[str, Any]] = None  # Optional per spec
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class StreamResponse(BaseModel):
     """Anthropic streaming response."""
 
     type: str
     delta: Optional[TextDelta] = None
-    content_block: Optional[Union[TextBlock, ToolUseBlock]] = None
+    content_block: Optional[ResponseContentBlock] = None
     content_block_delta: Optional[TextDelta] = None
     message: Optional[MessageResponse] = None
     usage: Optional[Dict[str, int]] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class CountTokensRequest(BaseModel):
     """Count tokens request."""
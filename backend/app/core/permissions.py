@@ -1,6 +1,8 @@
 """Permission constants and categories for role-based access control."""
+from dataclasses import dataclass
 from typing import Literal
 from enum import Enum
+from types import MappingProxyType
 
 
 class PermissionCategory(str, Enum):
@@ -16,58 +18,69 @@ class PermissionCategory(str, Enum):
     USERS = "users"
 
 
+@dataclass(slots=True, frozen=True)
+class PermissionMeta:
+    """Display metadata for a permission category."""
+    name: str
+    category: Literal["feature", "admin"]
+    description: str
+
+
+# The tables below are read-only views shared by every caller; copy them
+# (e.g. ``dict(DEFAULT_USER_PERMISSIONS)``) before changing anything.
+
 # Permission metadata with names and descriptions
-PERMISSIONS: dict[PermissionCategory, dict] = {
-    PermissionCategory.CHAT: {
-        "name": "Chat Access",
-        "category": "feature",
-        "description": "Access to chat functionality and messaging API"
-    },
-    PermissionCategory.CONVERSATIONS: {
-        "name": "Conversation Management",
-        "category": "feature",
-        "description": "Create, edit, delete conversations"
-    },
-    PermissionCategory.PREFERENCES: {
-        "name": "User Preferences",
-        "category": "feature",
-        "description": "Modify personal preferences (language, theme)"
-    },
-    PermissionCategory.PROVIDERS: {
-        "name": "Provider Management",
-        "category": "admin",
-        "description": "View and configure AI providers"
-    },
-    PermissionCategory.API_KEYS: {
-        "name": "API Key Management",
-        "category": "admin",
-        "description": "Create and manage API keys"
-    },
-    PermissionCategory.STATS: {
-        "name": "Statistics & Logs",
-        "category": "admin",
-        "description": "View usage statistics and request logs"
-    },
-    PermissionCategory.HEALTH: {
-        "name": "Health Monitoring",
-        "category": "admin",
-        "description": "View provider health status"
-    },
-    PermissionCategory.CONFIG: {
-        "name": "System Configuration",
-        "category": "admin",
-        "description": "Modify global system settings"
-    },
-    PermissionCategory.USERS: {
-        "name": "User Management",
-        "category": "admin",
-        "description": "View and manage user accounts"
-    },
-}
+PERMISSIONS: MappingProxyType[PermissionCategory, PermissionMeta] = MappingProxyType({
+    PermissionCategory.CHAT: PermissionMeta(
+        name="Chat Access",
+        category="feature",
+        description="Access to chat functionality and messaging API"
+    ),
+    PermissionCategory.CONVERSATIONS: PermissionMeta(
+        name="Conversation Management",
+        category="feature",
+        description="Create, edit, delete conversations"
+    ),
+    PermissionCategory.PREFERENCES: PermissionMeta(
+        name="User Preferences",
+        category="feature",
+        description="Modify personal preferences (language, theme)"
+    ),
+    PermissionCategory.PROVIDERS: PermissionMeta(
+        name="Provider Management",
+        category="admin",
+        description="View and configure AI providers"
+    ),
+    PermissionCategory.API_KEYS: PermissionMeta(
+        name="API Key Management",
+        category="admin",
+        description="Create and manage API keys"
+    ),
+    PermissionCategory.STATS: PermissionMeta(
+        name="Statistics & Logs",
+        category="admin",
+        description="View usage statistics and request logs"
+    ),
+    PermissionCategory.HEALTH: PermissionMeta(
+        name="Health Monitoring",
+        category="admin",
+        description="View provider health status"
+    ),
+    PermissionCategory.CONFIG: PermissionMeta(
+        name="System Configuration",
+        category="admin",
+        description="Modify global system settings"
+    ),
+    PermissionCategory.USERS: PermissionMeta(
+        name="User Management",
+        category="admin",
+        description="View and manage user accounts"
+    ),
+})
 
 
 # Default permissions for regular users (non-admin)
-DEFAULT_USER_PERMISSIONS: dict[PermissionCategory, bool] = {
+DEFAULT_USER_PERMISSIONS: MappingProxyType[PermissionCategory, bool] = MappingProxyType({
     PermissionCategory.CHAT: True,
     PermissionCategory.CONVERSATIONS: True,
     PermissionCategory.PREFERENCES: True,
@@ -77,10 +90,25 @@ DEFAULT_USER_PERMISSIONS: dict[PermissionCategory, bool] = {
     PermissionCategory.HEALTH: False,
     PermissionCategory.CONFIG: False,
     PermissionCategory.USERS: False,
-}
+})
 
 
 # Admin gets all permissions
-ADMIN_PERMISSIONS: dict[PermissionCategory, bool] = {
+ADMIN_PERMISSIONS: MappingProxyType[PermissionCategory, bool] = MappingProxyType({
     cat: True for cat in PermissionCategory
-}
+})
+
+# Granted categories as sets, for membership checks
+ADMIN_PERMISSION_SET = frozenset(PermissionCategory)
+DEFAULT_USER_PERMISSION_SET = frozenset(
+    cat for cat, granted in DEFAULT_USER_PERMISSIONS.items() if granted
+)
+
+
+def has_permission(is_admin: bool, category: PermissionCategory) -> bool:
+    """Check whether the default permissions of a role include a category.
+
+    Plain strings such as ``"chat"`` work too, since PermissionCategory is a
+    str Enum.
+    """
+    return category in (ADMIN_PERMISSION_SET if is_admin else DEFAULT_USER_PERMISSION_SET)
@@ -41,9 +41,11 @@ class DatabaseManager:
         if not self._initialized:
             await self.core.init_database()
             self._initialized = True
+        self.api_keys.start_last_used_flusher()
     
     async def close(self):
         """Close database connections."""
+        await self.api_keys.stop_last_used_flusher()
         await self.core.close()
 
     def _get_connection(self):
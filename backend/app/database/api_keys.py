@@ -1,10 +1,23 @@
 """API Key management database operations."""
+import asyncio
 import aiosqlite
 import logging
-from typing import Optional, List, Dict, Any
+import time
+from typing import Optional, List, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Active keys found by hash are cached so authenticated requests skip the
+# lookup query. Updates and deletes through this manager invalidate the entry;
+# the TTL bounds how long other worker processes may see a revoked key.
+API_KEY_CACHE_TTL = 30  # seconds
+API_KEY_CACHE_MAX_SIZE = 4096
+
+# last_used_at updates are collected in memory and written in one batch every
+# this many seconds by a background task, instead of one UPDATE per
+# authenticated request.
+LAST_USED_FLUSH_INTERVAL = 5  # seconds
+
 
 class APIKeysManager:
     """Manages API keys in the database."""
@@ -17,6 +30,10 @@ class APIKeysManager:
             db_core: DatabaseCore instance for connection management.
         """
         self.db_core = db_core
+        self._key_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._last_used_pending: Dict[int, str] = {}
+        self._next_last_used_flush = 0.0
+        self._last_used_flusher: Optional[asyncio.Task] = None
 
     async def _execute_query(
         self,
@@ -134,6 +151,12 @@ class APIKeysManager:
         Returns:
             API key info dict if found and active, None otherwise.
         """
+        cached = self._key_cache.get(key_hash)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                return dict(cached[1])
+            del self._key_cache[key_hash]
+
         row = await self._execute_query(
             """
             SELECT id, key_hash, key_prefix, encrypted_key, name, email, user_id, is_active, created_at, last_used_at, updated_at
@@ -142,7 +165,21 @@ class APIKeysManager:
             (key_hash,),
             fetch_one=True
         )
-        return dict(row) if row else None
+        if not row:
+            return None
+
+        api_key_data = dict(row)
+        if len(self._key_cache) >= API_KEY_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            self._key_cache.pop(next(iter(self._key_cache)))
+        self._key_cache[key_hash] = (time.monotonic() + API_KEY_CACHE_TTL, api_key_data)
+        return dict(api_key_data)
+
+    def _invalidate_cached_key(self, api_key_id: int) -> None:
+        """Drop any cached lookup for the given API key ID."""
+        for key_hash, (_, api_key_data) in list(self._key_cache.items()):
+            if api_key_data["id"] == api_key_id:
+                del self._key_cache[key_hash]
 
     async def get_api_keys(
         self,
@@ -240,6 +277,7 @@ class APIKeysManager:
 
         query = f"UPDATE api_keys SET {', '.join(updates)} WHERE id = ?"
         row_count = await self._execute_update(query, tuple(params))
+        self._invalidate_cached_key(api_key_id)
         return row_count > 0
 
     async def delete_api_key(self, api_key_id: int) -> bool:
@@ -252,17 +290,65 @@ class APIKeysManager:
             "DELETE FROM api_keys WHERE id = ?",
             (api_key_id,)
         )
+        self._invalidate_cached_key(api_key_id)
         return row_count > 0
 
     async def update_api_key_last_used(self, api_key_id: int) -> None:
-        """Update API key's last used time."""
-        await self._execute_update(
-            """
-            UPDATE api_keys SET last_used_at = CURRENT_TIMESTAMP WHERE id = ?
-            """,
-            (api_key_id,),
-            commit=True
-        )
+        """Record API key's last used time.
+
+        The timestamp is taken now but written together with other pending
+        updates by the background flusher. Without a running flusher the
+        batch is written by the first call after LAST_USED_FLUSH_INTERVAL.
+        """
+        # Same format as SQLite's CURRENT_TIMESTAMP (UTC)
+        self._last_used_pending[api_key_id] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        if self._last_used_flusher is None and time.monotonic() >= self._next_last_used_flush:
+            await self.flush_last_used()
+
+    async def flush_last_used(self) -> None:
+        """Write all pending last used times in a single transaction.
+
+        Entries that fail to write are kept pending for the next flush.
+        """
+        self._next_last_used_flush = time.monotonic() + LAST_USED_FLUSH_INTERVAL
+        if not self._last_used_pending:
+            return
+
+        pending, self._last_used_pending = self._last_used_pending, {}
+        try:
+            conn = await self.db_core.get_connection()
+            await conn.executemany(
+                "UPDATE api_keys SET last_used_at = ? WHERE id = ?",
+                [(last_used_at, api_key_id) for api_key_id, last_used_at in pending.items()]
+            )
+            await conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to update API key last used time: {e}")
+            # Keep newer timestamps recorded while the write was in flight
+            for api_key_id, last_used_at in pending.items():
+                self._last_used_pending.setdefault(api_key_id, last_used_at)
+
+    async def _flush_last_used_periodically(self) -> None:
+        """Background loop writing pending last used times."""
+        while True:
+            await asyncio.sleep(LAST_USED_FLUSH_INTERVAL)
+            await self.flush_last_used()
+
+    def start_last_used_flusher(self) -> None:
+        """Start the background task that writes last used times."""
+        if self._last_used_flusher is None:
+            self._last_used_flusher = asyncio.create_task(self._flush_last_used_periodically())
+
+    async def stop_last_used_flusher(self) -> None:
+        """Stop the background flusher and write anything still pending."""
+        if self._last_used_flusher is not None:
+            self._last_used_flusher.cancel()
+            try:
+                await self._last_used_flusher
+            except asyncio.CancelledError:
+                pass
+            self._last_used_flusher = None
+        await self.flush_last_used()
 
     async def get_api_key_encrypted(self, api_key_id: int) -> Optional[Dict[str, Any]]:
         """Get API key info including encrypted full key by ID.
@@ -48,6 +48,10 @@ class DatabaseCore:
             await cursor.execute("PRAGMA synchronous=NORMAL")
             await cursor.execute("PRAGMA cache_size=-64000")  # 64MB cache
             await cursor.execute("PRAGMA temp_store=MEMORY")
+            # Wait for locks held by other processes instead of failing with
+            # "database is locked" (matches the connect timeout)
+            await cursor.execute(f"PRAGMA busy_timeout={int(self._pool_timeout * 1000)}")
+            await cursor.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped reads
             await self._pool.commit()
             await cursor.close()
             logger.info(f"Database connection pool initialized: {self.db_path}")
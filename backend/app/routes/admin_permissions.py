@@ -4,6 +4,7 @@ from pydantic import BaseModel
 from typing import Optional
 import json
 import logging
+import re
 
 from ..core.auth import require_admin, require_users
 from ..core.permissions import PermissionCategory, PERMISSIONS
@@ -12,6 +13,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/admin/permissions", tags=["admin_permissions"])
 
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+# Longest valid address (RFC 5321); longer input is rejected before the regex runs
+_MAX_EMAIL_LENGTH = 254
+
+
+def _is_valid_email(email: str) -> bool:
+    """Check an (already lowercased) email address against _EMAIL_RE."""
+    return len(email) <= _MAX_EMAIL_LENGTH and _EMAIL_RE.match(email) is not None
+
 
 class PermissionInfo(BaseModel):
     """Permission information for UI."""
@@ -45,11 +55,11 @@ async def list_all_permissions(admin: dict = Depends(require_admin())):
     permissions_list = [
         PermissionInfo(
             code=code.value,
-            name=data["name"],
-            category=data["category"],
-            description=data["description"]
+            name=meta.name,
+            category=meta.category,
+            description=meta.description
         )
-        for code, data in PERMISSIONS.items()
+        for code, meta in PERMISSIONS.items()
         if code != PermissionCategory.USERS  # Exclude users permission
     ]
 
@@ -325,17 +335,16 @@ async def create_user(
     """Create user (admin only). Permissions are set automatically based on role."""
     from ..database import get_database
     from ..core.auth import hash_password
-    import re
 
     db = get_database()
 
     # Validate email format
-    email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    if not re.match(email_pattern, request.email.lower()):
+    email = request.email.lower()
+    if not _is_valid_email(email):
         raise HTTPException(status_code=400, detail="Invalid email format")
 
     # Check if email already exists
-    existing = await db.get_user_by_email(request.email.lower())
+    existing = await db.get_user_by_email(email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
@@ -344,9 +353,9 @@ async def create_user(
         raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
 
     # Create user - permissions are set automatically by create_user based on is_admin
-    password_hash = hash_password(request.password)
+    password_hash = await hash_password(request.password)
     user_id = await db.create_user(
-        email=request.email.lower(),
+        email=email,
         password_hash=password_hash,
         name=request.name,
         is_admin=request.is_admin
@@ -379,8 +388,8 @@ async def update_user(
 ):
     """Update user info (admin only)."""
     from ..database import get_database
+    from ..core.auth import hash_password
     from ..core.permissions import DEFAULT_USER_PERMISSIONS, ADMIN_PERMISSIONS
-    import re
 
     db = get_database()
 
@@ -401,8 +410,7 @@ async def update_user(
 
     # Validate email if provided
     if request.email:
-        email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        if not re.match(email_pattern, request.email.lower()):
+        if not _is_valid_email(request.email.lower()):
             raise HTTPException(status_code=400, detail="Invalid email format")
 
         # Check if email is already taken by another user
@@ -440,7 +448,7 @@ async def update_user(
     if request.password:
         if len(request.password) < 8:
             raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
-        password_hash = hash_password(request.password)
+        password_hash = await hash_password(request.password)
         await db.update_user_password(user_id, password_hash)
         logger.info(f"Admin {admin['email']} updated password for user {user_id}")
 
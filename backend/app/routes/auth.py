@@ -74,7 +74,7 @@ async def login(request: LoginRequest):
         )
     
     # 验证密码
-    if not verify_password(request.password, user["password_hash"]):
+    if not await verify_password(request.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -127,7 +127,7 @@ async def register(
         )
     
     # 创建用户
-    password_hash = hash_password(request.password)
+    password_hash = await hash_password(request.password)
     user_id = await db.create_user(
         email=request.email.lower(),
         password_hash=password_hash,
@@ -210,7 +210,7 @@ async def change_password(
         )
 
     # 验证当前密码是否正确
-    if not verify_password(request.current_password, user["password_hash"]):
+    if not await verify_password(request.current_password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
@@ -224,7 +224,7 @@ async def change_password(
         )
 
     # 哈希新密码
-    new_password_hash = hash_password(request.new_password)
+    new_password_hash = await hash_password(request.new_password)
 
     # 更新密码
     await db.update_user_password(user["id"], new_password_hash)
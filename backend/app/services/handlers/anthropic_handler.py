@@ -15,6 +15,7 @@ from ...config import config
 from ...core import MessagesRequest, ModelManager, COST_PER_INPUT_TOKEN, COST_PER_OUTPUT_TOKEN, COLOR_GREEN, COLOR_YELLOW, COLOR_RESET, COLOR_CYAN
 from ...infrastructure import AnthropicClient, retry_with_backoff
 from ..token_counter import count_tokens_estimate
+from ...utils import encode_sse_event
 from ...utils.token_extractor import extract_tokens_from_usage, update_token_tracking
 
 logger = logging.getLogger(__name__)
@@ -150,7 +151,7 @@ def _handle_thinking_from_streaming_text(
 
     Returns:
         Tuple of (events, new_reasoning_flag, new_total_output_tokens, should_continue)
-        - events: List of SSE event strings to yield
+        - events: List of SSE event frames (bytes) to yield
         - new_reasoning_flag: Updated reasoning state
         - new_total_output_tokens: Updated token count
         - should_continue: Whether to skip normal chunk processing
@@ -247,10 +248,7 @@ def _handle_thinking_from_streaming_text(
                     "thinking": thinking_content
                 }
             }
-            events.append(
-                f"event: content_block_delta\n"
-                f"data: {json.dumps(thinking_event, ensure_ascii=False, separators=(',', ':'))}\n\n"
-            )
+            events.append(encode_sse_event(thinking_event))
             new_total_output_tokens += len(thinking_content.split())
 
         # Update chunk text
@@ -403,12 +401,7 @@ class AnthropicMessageHandler(BaseRequestHandler):
                             if skip_chunk:
                                 continue
 
-                        json_str = json.dumps(chunk, ensure_ascii=False, separators=(',', ':'), sort_keys=False)
-                        event_type = chunk.get("type", "")
-                        if event_type:
-                            yield f"event: {event_type}\ndata: {json_str}\n\n"
-                        else:
-                            yield f"data: {json_str}\n\n"
+                        yield encode_sse_event(chunk)
 
                     # Stream completed
                     if chunk_count == 0:
@@ -16,7 +16,7 @@ from ...config import config
 from ...core import MessagesRequest, Message, ModelManager, COST_PER_INPUT_TOKEN, COST_PER_OUTPUT_TOKEN, COLOR_GREEN, COLOR_YELLOW, COLOR_RESET, COLOR_CYAN
 from ...converters import to_openai, to_anthropic, to_anthropic_async
 from ...infrastructure import OpenAIClient, retry_with_backoff, get_cache_manager
-from ...utils import openai_response_to_dict
+from ...utils import openai_response_to_dict, encode_sse_event
 from ..token_counter import count_tokens_estimate
 from ...utils.token_extractor import extract_tokens_from_usage
 
@@ -190,9 +190,16 @@ class OpenAIMessageHandler(BaseRequestHandler):
             input_tokens: Input token count for the request
 
         Returns:
-            Async iterator of Anthropic-format streaming chunks
+            Async iterator of Anthropic-format streaming chunks; content block
+            events are pre-encoded SSE frames (bytes)
         """
-        return to_anthropic_async(openai_stream, original_model, input_tokens)
+        return to_anthropic_async(
+            openai_stream,
+            original_model,
+            input_tokens,
+            serialize=True,
+            coalesce_window=config.app_config.stream_text_coalesce_ms / 1000
+        )
 
     async def _log_modelscope_error(self, api_params: dict, actual_model: str):
         """Log detailed error information for modelscope provider."""
@@ -201,7 +208,6 @@ class OpenAIMessageHandler(BaseRequestHandler):
                    f"has_tools={bool(api_params.get('tools'))}, "
                    f"message_count={len(api_params.get('messages', []))}, "
                    f"has_tool_choice={'tool_choice' in api_params}")
-        import json as json_module
         for idx, msg in enumerate(api_params.get("messages", [])):
             msg_info = {
                 "index": idx,
@@ -219,7 +225,7 @@ class OpenAIMessageHandler(BaseRequestHandler):
                     msg_info["content_preview"] = f"list[{len(content)} items]"
                 else:
                     msg_info["content_preview"] = str(content)[:100]
-            logger.debug(f"Message {idx}: {json_module.dumps(msg_info, ensure_ascii=False)}")
+            logger.debug(f"Message {idx}: {json.dumps(msg_info, ensure_ascii=False)}")
 
     async def handle_streaming(
         self,
@@ -321,6 +327,10 @@ class OpenAIMessageHandler(BaseRequestHandler):
                             ):
                                 chunk_count += 1
 
+                                # Content block events arrive already encoded as SSE frames
+                                if isinstance(chunk, bytes):
+                                    yield chunk
+                                    continue
 
                                 if chunk.get("type") == "message_metadata":
                                     actual_provider = chunk.get("actual_provider")
@@ -338,12 +348,7 @@ class OpenAIMessageHandler(BaseRequestHandler):
                                         actual_input_tokens, actual_output_tokens = extract_tokens_from_usage(chunk_usage)
                                         logger.debug(f"Received actual usage: input={actual_input_tokens}, output={actual_output_tokens}")
 
-                                json_str = json.dumps(chunk, ensure_ascii=False, separators=(',', ':'), sort_keys=False)
-                                event_type = chunk.get("type", "")
-                                if event_type:
-                                    yield f"event: {event_type}\ndata: {json_str}\n\n"
-                                else:
-                                    yield f"data: {json_str}\n\n"
+                                yield encode_sse_event(chunk)
                         except Exception as stream_error:
                             logger.error(f"Error iterating stream: {stream_error}", exc_info=True)
                             raise
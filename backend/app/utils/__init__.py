@@ -11,6 +11,7 @@ from .color_logger import (
     format_log_message,
     setup_colored_logging
 )
+from .sse import dumps_json, loads_json, encode_sse_event
 
 __all__ = [
     'openai_response_to_dict',
@@ -21,4 +22,7 @@ __all__ = [
     'highlight_field',
     'format_log_message',
     'setup_colored_logging',
+    'dumps_json',
+    'loads_json',
+    'encode_sse_event',
 ]
@@ -0,0 +1,53 @@
+"""Server-Sent Events (SSE) encoding utilities."""
+import json
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 JSON bytes.
+
+    Uses orjson when installed and falls back to the standard library for
+    payloads orjson rejects (e.g. integers wider than 64 bits).
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document, using orjson when installed.
+
+    Raises ValueError (or TypeError for non-string input) on failure, like
+    ``json.loads``.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_sse_event(event: Dict[str, Any]) -> bytes:
+    """Encode an event dict as a complete SSE frame.
+
+    The JSON encoding and the ``event:``/``data:`` framing are produced in a
+    single pass so callers can write the result straight to the response.
+
+    Args:
+        event: Event dict, typically carrying a ``type`` key
+
+    Returns:
+        SSE frame bytes terminated by a blank line
+    """
+    data = dumps_json(event)
+    event_type = event.get("type")
+    if event_type:
+        return b"event: " + event_type.encode('utf-8') + b"\ndata: " + data + b"\n\n"
+    return b"data: " + data + b"\n\n"
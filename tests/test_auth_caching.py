@@ -0,0 +1,207 @@
+"""Tests for the in-process caches used by authentication."""
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to Python path for CI/CD environments
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from backend.app.database import api_keys as api_keys_module
+from backend.app.database.api_keys import APIKeysManager
+from backend.app.database.core import DatabaseCore
+
+
+class FakeClock:
+    """Stands in for the time module so cache expiry can be stepped manually."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.strftime = time.strftime
+        self.gmtime = time.gmtime
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+async def db_core(tmp_path):
+    core = DatabaseCore(str(tmp_path / "test.db"))
+    await core.init_database()
+    yield core
+    await core.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(api_keys_module, "time", fake)
+    return fake
+
+
+async def set_active_directly(db_core, api_key_id, is_active):
+    """Change a key behind the manager's back, like another worker would."""
+    conn = await db_core.get_connection()
+    await conn.execute("UPDATE api_keys SET is_active = ? WHERE id = ?", (is_active, api_key_id))
+    await conn.commit()
+
+
+async def test_cached_key_expires_after_ttl(db_core, clock):
+    manager = APIKeysManager(db_core)
+    api_key_id = await manager.create_api_key("hash-1", "sk-1...", "first")
+
+    assert (await manager.get_api_key_by_hash("hash-1"))["id"] == api_key_id
+    await set_active_directly(db_core, api_key_id, 0)
+
+    clock.now += api_keys_module.API_KEY_CACHE_TTL - 1
+    assert await manager.get_api_key_by_hash("hash-1") is not None
+
+    clock.now += 2
+    assert await manager.get_api_key_by_hash("hash-1") is None
+
+
+async def test_update_invalidates_cached_key(db_core, clock):
+    manager = APIKeysManager(db_core)
+    api_key_id = await manager.create_api_key("hash-2", "sk-2...", "second")
+    assert await manager.get_api_key_by_hash("hash-2") is not None
+
+    assert await manager.update_api_key(api_key_id, is_active=False)
+    assert await manager.get_api_key_by_hash("hash-2") is None
+
+
+async def test_delete_invalidates_cached_key(db_core, clock):
+    manager = APIKeysManager(db_core)
+    api_key_id = await manager.create_api_key("hash-3", "sk-3...", "third")
+    assert await manager.get_api_key_by_hash("hash-3") is not None
+
+    assert await manager.delete_api_key(api_key_id)
+    assert await manager.get_api_key_by_hash("hash-3") is None
+
+
+async def test_unknown_keys_are_not_cached(db_core, clock):
+    manager = APIKeysManager(db_core)
+    assert await manager.get_api_key_by_hash("missing") is None
+    assert manager._key_cache == {}
+
+
+async def test_cached_key_is_returned_as_copy(db_core, clock):
+    manager = APIKeysManager(db_core)
+    await manager.create_api_key("hash-4", "sk-4...", "fourth")
+
+    first = await manager.get_api_key_by_hash("hash-4")
+    first["name"] = "changed"
+    assert (await manager.get_api_key_by_hash("hash-4"))["name"] == "fourth"
+
+
+async def read_last_used(db_core, api_key_id):
+    conn = await db_core.get_connection()
+    cursor = await conn.execute("SELECT last_used_at FROM api_keys WHERE id = ?", (api_key_id,))
+    row = await cursor.fetchone()
+    await cursor.close()
+    return row["last_used_at"]
+
+
+async def test_last_used_updates_are_batched(db_core, clock):
+    manager = APIKeysManager(db_core)
+    first = await manager.create_api_key("hash-5", "sk-5...", "fifth")
+    second = await manager.create_api_key("hash-6", "sk-6...", "sixth")
+
+    # The first update is due immediately and starts the interval
+    await manager.update_api_key_last_used(first)
+    assert await read_last_used(db_core, first) is not None
+
+    await manager.update_api_key_last_used(second)
+    await manager.update_api_key_last_used(first)
+    assert await read_last_used(db_core, second) is None
+    assert set(manager._last_used_pending) == {first, second}
+
+    await manager.flush_last_used()
+    assert await read_last_used(db_core, second) is not None
+    assert manager._last_used_pending == {}
+
+
+async def test_failed_last_used_flush_keeps_entries(db_core, clock):
+    manager = APIKeysManager(db_core)
+    api_key_id = await manager.create_api_key("hash-7", "sk-7...", "seventh")
+    manager._last_used_pending[api_key_id] = "2024-01-01 00:00:00"
+
+    async def broken_connection():
+        raise RuntimeError("database is locked")
+
+    original = db_core.get_connection
+    db_core.get_connection = broken_connection
+    try:
+        await manager.flush_last_used()
+    finally:
+        db_core.get_connection = original
+    assert manager._last_used_pending == {api_key_id: "2024-01-01 00:00:00"}
+
+    await manager.flush_last_used()
+    assert await read_last_used(db_core, api_key_id) == "2024-01-01 00:00:00"
+
+
+async def test_pending_last_used_written_on_close(tmp_path):
+    from backend.app.database import DatabaseManager
+
+    db_path = str(tmp_path / "close.db")
+    db = DatabaseManager(db_path)
+    await db.initialize()
+    assert db.api_keys._last_used_flusher is not None
+
+    api_key_id = await db.api_keys.create_api_key("hash-8", "sk-8...", "eighth")
+    db.api_keys._last_used_pending[api_key_id] = "2024-01-02 03:04:05"
+    await db.close()
+    assert db.api_keys._last_used_flusher is None
+
+    core = DatabaseCore(db_path)
+    try:
+        assert await read_last_used(core, api_key_id) == "2024-01-02 03:04:05"
+    finally:
+        await core.close()
+
+
+@pytest.fixture
+def jwt_cache(monkeypatch):
+    from backend.app.core import auth
+
+    monkeypatch.setattr(auth, "_verified_tokens", {})
+    return auth
+
+
+def test_jwt_cache_entry_does_not_outlive_token(jwt_cache):
+    from datetime import timedelta
+
+    token = jwt_cache.create_access_token({"sub": 7}, expires_delta=timedelta(seconds=60))
+    assert jwt_cache.verify_jwt_token(token)["user_id"] == 7
+
+    cache_until = jwt_cache._verified_tokens[token][0]
+    exp = jwt_cache.jwt.get_unverified_claims(token)["exp"]
+    assert cache_until == exp
+    assert cache_until < time.time() + jwt_cache.JWT_CACHE_TTL
+
+
+def test_jwt_cache_evicts_oldest_entry(jwt_cache, monkeypatch):
+    monkeypatch.setattr(jwt_cache, "JWT_CACHE_MAX_SIZE", 2)
+    tokens = [jwt_cache.create_access_token({"sub": user_id}) for user_id in (1, 2, 3)]
+    for token in tokens:
+        assert jwt_cache.verify_jwt_token(token) is not None
+
+    assert list(jwt_cache._verified_tokens) == tokens[1:]
+
+
+def test_jwt_cache_returns_copies(jwt_cache):
+    token = jwt_cache.create_access_token({"sub": 9, "is_admin": False})
+
+    first = jwt_cache.verify_jwt_token(token)
+    first["is_admin"] = True
+    second = jwt_cache.verify_jwt_token(token)
+    assert second == {"user_id": 9, "is_admin": False, "type": "jwt"}
+    assert jwt_cache._verified_tokens[token][1]["is_admin"] is False
+
+
+def test_jwt_cache_skips_invalid_tokens(jwt_cache):
+    assert jwt_cache.verify_jwt_token("not-a-token") is None
+    assert jwt_cache._verified_tokens == {}
@@ -0,0 +1,65 @@
+"""Tests for config file change handling."""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Add parent directory to Python path for CI/CD environments
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from backend.app.config import hot_reload
+from backend.app.config.hot_reload import ConfigFileHandler
+
+
+def file_event(src_path, dest_path=None):
+    return SimpleNamespace(is_directory=False, src_path=str(src_path), dest_path=str(dest_path or ""))
+
+
+def wait_for_reloads():
+    time.sleep(hot_reload.RELOAD_DEBOUNCE_SECONDS * 3)
+
+
+def test_burst_of_writes_reloads_once_with_final_content(tmp_path):
+    config_file = tmp_path / "provider.json"
+    config_file.write_text("{}")
+    seen = []
+    handler = ConfigFileHandler(str(config_file), lambda: seen.append(config_file.read_text()))
+
+    for content in ('{"a"', '{"a": 1', '{"a": 1}'):
+        config_file.write_text(content)
+        os.utime(config_file, (time.time(), time.time() + len(content)))
+        handler.on_modified(file_event(config_file))
+    wait_for_reloads()
+
+    assert seen == ['{"a": 1}']
+
+
+def test_atomic_rename_into_place_triggers_reload(tmp_path):
+    config_file = tmp_path / "provider.json"
+    config_file.write_text("{}")
+    seen = []
+    handler = ConfigFileHandler(str(config_file), lambda: seen.append(True))
+
+    temp_file = tmp_path / ".provider.json.tmp"
+    temp_file.write_text('{"b": 2}')
+    os.replace(temp_file, config_file)
+    os.utime(config_file, (time.time(), time.time() + 10))
+    handler.on_moved(file_event(temp_file, config_file))
+    wait_for_reloads()
+
+    assert seen == [True]
+
+
+def test_other_files_in_directory_are_ignored(tmp_path):
+    config_file = tmp_path / "provider.json"
+    config_file.write_text("{}")
+    seen = []
+    handler = ConfigFileHandler(str(config_file), lambda: seen.append(True))
+
+    handler.on_modified(file_event(tmp_path / "other.json"))
+    handler.on_created(file_event(tmp_path / "other.json"))
+
+    assert handler._pending_timer is None
+    assert seen == []
@@ -178,6 +178,22 @@ def test_convert_openai_response():
     assert anthropic_response["usage"]["output_tokens"] == 5
 
 
+def test_empty_openai_responses_do_not_share_content():
+    """Test that empty responses each get their own placeholder text block."""
+    openai_response = {
+        "id": "chatcmpl-456",
+        "choices": [{"message": {"role": "assistant", "content": None}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 0}
+    }
+
+    first = convert_openai_response_to_anthropic(openai_response, "haiku")
+    assert first["content"] == [{"type": "text", "text": ""}]
+    first["content"][0]["text"] = "edited"
+
+    second = convert_openai_response_to_anthropic(openai_response, "haiku")
+    assert second["content"] == [{"type": "text", "text": ""}]
+
+
 def test_model_name_extraction():
     """Test model name extraction from full Anthropic model names."""
     from backend.app.config import Config
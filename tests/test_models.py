@@ -0,0 +1,66 @@
+"""Tests for request/response model validation."""
+import os
+import sys
+
+# Add parent directory to Python path for CI/CD environments
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from backend.app.core.models import (
+    ContentBlock,
+    ImageContent,
+    Message,
+    MessageResponse,
+    TextContent,
+    ToolUseBlock,
+)
+
+
+def test_message_content_blocks_pick_model_by_type():
+    message = Message(role="user", content=[
+        {"type": "text", "text": "hi"},
+        {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "aGk="}},
+        {"type": "tool_result", "tool_use_id": "toolu_1", "content": "done"},
+    ])
+    assert [type(block) for block in message.content] == [TextContent, ImageContent, ContentBlock]
+    assert message.content[2].model_dump()["tool_use_id"] == "toolu_1"
+
+
+def test_incomplete_text_and_image_blocks_fall_back_to_content_block():
+    message = Message(role="user", content=[{"type": "text"}, {"type": "image"}])
+    assert [type(block) for block in message.content] == [ContentBlock, ContentBlock]
+
+
+def test_text_block_with_null_text_validates_as_content_block():
+    message = Message(role="user", content=[{"type": "text", "text": None}])
+    assert type(message.content[0]) is ContentBlock
+    assert message.content[0].text is None
+
+
+def test_block_without_type_uses_text_content_default():
+    message = Message(role="user", content=[{"text": "hi"}])
+    assert type(message.content[0]) is TextContent
+    assert message.content[0].type == "text"
+
+
+def test_text_block_with_other_block_fields_validates_as_content_block():
+    message = Message(role="user", content=[{"type": "text", "text": "hi", "name": "note"}])
+    assert type(message.content[0]) is ContentBlock
+    assert message.content[0].name == "note"
+
+
+def test_message_content_accepts_model_instances_and_strings():
+    assert Message(role="user", content="hello").content == "hello"
+    block = TextContent(text="hi")
+    assert Message(role="user", content=[block]).content == [block]
+
+
+def test_response_content_discriminated_by_type():
+    response = MessageResponse(
+        id="msg_1",
+        content=[{"type": "tool_use", "id": "toolu_1", "name": "lookup", "input": {}}],
+        model="claude-test",
+        usage={"input_tokens": 1, "output_tokens": 1},
+    )
+    assert isinstance(response.content[0], ToolUseBlock)
@@ -98,6 +98,53 @@ def test_string_concatenation_performance():
     print()
 
 
+def test_text_coalescing_performance():
+    """Compare streaming conversion with and without text delta coalescing."""
+    import asyncio
+    import os
+    import sys
+    from types import SimpleNamespace
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    from backend.app.converters.openai_response_convert import to_anthropic_async
+
+    print("=" * 60)
+    print("Text Delta Coalescing Performance Test")
+    print("=" * 60)
+
+    chunk_count = 5000
+
+    def make_chunk(content=None, finish_reason=None):
+        delta = SimpleNamespace(content=content, tool_calls=None)
+        choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+        return SimpleNamespace(id="chatcmpl-bench", choices=[choice], usage=None)
+
+    chunks = [make_chunk(content="token ") for _ in range(chunk_count)]
+    chunks.append(make_chunk(finish_reason="stop"))
+
+    async def upstream():
+        for chunk in chunks:
+            yield chunk
+
+    async def convert(window):
+        frames = 0
+        start = time.perf_counter()
+        async for event in to_anthropic_async(upstream(), "claude-bench", serialize=True, coalesce_window=window):
+            frames += 1
+        return (time.perf_counter() - start) * 1000, frames
+
+    results = {}
+    for label, window in (("off", 0.0), ("5 ms", 0.005)):
+        elapsed, frames = asyncio.run(convert(window))
+        results[label] = frames
+        print(f"Coalescing {label}: {elapsed:.2f} ms, {frames} events ({chunk_count} upstream chunks)")
+
+    assert results["5 ms"] < results["off"]
+    print()
+
+
 def test_timeout_configuration():
     """Show timeout configuration impact."""
     print("=" * 60)
@@ -177,6 +224,7 @@ if __name__ == "__main__":
     # Run all tests
     test_json_serialization_performance()
     test_string_concatenation_performance()
+    test_text_coalescing_performance()
     test_timeout_configuration()
     generate_performance_report()
 
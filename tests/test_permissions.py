@@ -0,0 +1,46 @@
+"""Tests for the permission tables."""
+import os
+import sys
+
+import pytest
+
+# Add parent directory to Python path for CI/CD environments
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from backend.app.core.permissions import (
+    ADMIN_PERMISSIONS,
+    DEFAULT_USER_PERMISSIONS,
+    PERMISSIONS,
+    PermissionCategory,
+    has_permission,
+)
+
+
+def test_permission_tables_are_read_only():
+    for table in (PERMISSIONS, DEFAULT_USER_PERMISSIONS, ADMIN_PERMISSIONS):
+        with pytest.raises(TypeError):
+            table[PermissionCategory.USERS] = True
+
+
+def test_copies_of_defaults_are_mutable():
+    perms = DEFAULT_USER_PERMISSIONS.copy()
+    perms[PermissionCategory.USERS] = True
+    assert DEFAULT_USER_PERMISSIONS[PermissionCategory.USERS] is False
+
+
+@pytest.mark.parametrize("category", list(PermissionCategory))
+def test_has_permission_matches_tables(category):
+    assert has_permission(True, category) is ADMIN_PERMISSIONS[category]
+    assert has_permission(False, category) is DEFAULT_USER_PERMISSIONS[category]
+    assert has_permission(False, category.value) is DEFAULT_USER_PERMISSIONS[category]
+
+
+def test_permission_metadata_is_frozen():
+    from dataclasses import FrozenInstanceError
+
+    meta = PERMISSIONS[PermissionCategory.CHAT]
+    assert meta.category == "feature"
+    with pytest.raises(FrozenInstanceError):
+        meta.name = "Changed"
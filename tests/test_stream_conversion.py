@@ -0,0 +1,281 @@
+"""Tests for OpenAI -> Anthropic streaming conversion behaviour."""
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to Python path for CI/CD environments
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from backend.app.converters.openai_response_convert import to_anthropic_async
+
+
+def make_chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    """Build an SDK-like streaming chunk object."""
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(id="chatcmpl-test", choices=[choice], usage=usage)
+
+
+def make_tool_call(index, id=None, name=None, arguments=None):
+    """Build an SDK-like tool call delta."""
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(index=index, id=id, function=function)
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+def text_deltas(events):
+    return [
+        e["delta"]["text"] for e in events
+        if e.get("type") == "content_block_delta" and e["delta"]["type"] == "text_delta"
+    ]
+
+
+async def test_text_deltas_forwarded_individually_by_default():
+    async def stream():
+        for piece in ("Hel", "lo", "!"):
+            yield make_chunk(content=piece)
+        yield make_chunk(finish_reason="stop")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    assert text_deltas(events) == ["Hel", "lo", "!"]
+    assert events[-1] == {"type": "message_stop"}
+
+
+async def test_coalesces_back_to_back_text_deltas():
+    async def stream():
+        for piece in ("Hel", "lo", "!"):
+            yield make_chunk(content=piece)
+        yield make_chunk(finish_reason="stop")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test", coalesce_window=1.0))
+    assert text_deltas(events) == ["Hello!"]
+
+
+async def test_coalescing_flushes_when_upstream_stalls():
+    async def stream():
+        yield make_chunk(content="first")
+        await asyncio.sleep(0.05)
+        yield make_chunk(content="second")
+        yield make_chunk(finish_reason="stop")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test", coalesce_window=0.01))
+    assert text_deltas(events) == ["first", "second"]
+
+
+async def test_coalescing_flushes_text_before_tool_use():
+    async def stream():
+        yield make_chunk(content="<think>Need the weather</think>")
+        yield make_chunk(content="Let me ")
+        yield make_chunk(content="check")
+        yield make_chunk(tool_calls=[make_tool_call(0, id="call_1", name="get_weather", arguments="")])
+        yield make_chunk(tool_calls=[make_tool_call(0, arguments='{"city": "Paris"}')])
+        yield make_chunk(finish_reason="tool_calls")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test", coalesce_window=1.0))
+    types = [(e["type"], e.get("delta", {}).get("type")) for e in events]
+    text_pos = types.index(("content_block_delta", "text_delta"))
+    tool_start = next(i for i, e in enumerate(events)
+                      if e["type"] == "content_block_start" and e["content_block"]["type"] == "tool_use")
+    assert text_pos < tool_start
+    assert text_deltas(events) == ["Let me check"]
+
+
+async def test_out_of_range_tool_call_indexes_do_not_break_stream():
+    async def stream():
+        yield make_chunk(tool_calls=[make_tool_call(-1, id="call_neg", name="lookup", arguments='{"a": 1}')])
+        yield make_chunk(tool_calls=[make_tool_call(10**9, id="call_big", name="lookup", arguments='{"b": 2}')])
+        yield make_chunk(tool_calls=[make_tool_call("x", id="call_str", name="lookup", arguments='{"c": 3}')])
+        yield make_chunk(finish_reason="tool_calls")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    starts = [e["content_block"]["id"] for e in events if e["type"] == "content_block_start"]
+    assert starts == ["call_neg", "call_big", "call_str"]
+    stops = [e for e in events if e["type"] == "content_block_stop"]
+    assert len(stops) == 3
+    assert events[-1] == {"type": "message_stop"}
+
+
+async def test_coalescing_propagates_upstream_errors():
+    async def stream():
+        yield make_chunk(content="partial")
+        raise RuntimeError("upstream broke")
+
+    events = []
+    try:
+        async for event in to_anthropic_async(stream(), "claude-test", coalesce_window=1.0):
+            events.append(event)
+    except RuntimeError as e:
+        assert str(e) == "upstream broke"
+    else:
+        raise AssertionError("upstream error was swallowed")
+    assert not any(e.get("type") == "message_stop" for e in events)
+
+
+async def test_coalescing_releases_upstream_when_client_disconnects():
+    class Upstream:
+        closed = False
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            await asyncio.sleep(0)
+            return make_chunk(content="x")
+
+        async def aclose(self):
+            self.closed = True
+
+    upstream = Upstream()
+    tasks_before = asyncio.all_tasks()
+    converter = to_anthropic_async(upstream, "claude-test", coalesce_window=1.0)
+    async for event in converter:
+        if event.get("type") == "content_block_delta":
+            break
+    await converter.aclose()
+
+    assert upstream.closed
+    assert asyncio.all_tasks() == tasks_before
+
+
+def test_json_fragment_scanner_tracks_completion_across_splits():
+    from backend.app.converters.openai_response_convert import _ToolCallState, _scan_json_fragment
+
+    payload = '{"path": "C:\\\\dir\\\\", "q": "say \\"hi\\" {not [nested}", "n": [1, {"a": 2}]}'
+    for split_size in (1, 2, 3, 7, len(payload)):
+        state = _ToolCallState()
+        fragments = [payload[i:i + split_size] for i in range(0, len(payload), split_size)]
+        for fragment in fragments[:-1]:
+            _scan_json_fragment(state, fragment)
+            assert not state.args_complete()
+        _scan_json_fragment(state, fragments[-1])
+        assert state.args_complete()
+
+
+async def test_tool_arguments_streamed_as_valid_json():
+    import json
+
+    async def stream():
+        yield make_chunk(tool_calls=[make_tool_call(0, id="call_1", name="get_weather", arguments="")])
+        for piece in ('{"location":', ' "San', ' Francisco, CA"', ', "unit": "fahrenheit"}'):
+            yield make_chunk(tool_calls=[make_tool_call(0, arguments=piece)])
+        yield make_chunk(finish_reason="tool_calls")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    partial = "".join(
+        e["delta"]["partial_json"] for e in events
+        if e["type"] == "content_block_delta" and e["delta"]["type"] == "input_json_delta"
+    )
+    assert json.loads(partial) == {"location": "San Francisco, CA", "unit": "fahrenheit"}
+    assert events[-2]["delta"]["stop_reason"] == "tool_use"
+
+
+async def test_serialized_deltas_keep_their_own_payload():
+    async def stream():
+        for piece in ("Hel", "lo"):
+            yield make_chunk(content=piece)
+        yield make_chunk(finish_reason="stop")
+
+    frames = await collect(to_anthropic_async(stream(), "claude-test", serialize=True))
+    text_frames = [f for f in frames if isinstance(f, bytes) and b'"text_delta"' in f]
+    assert len(text_frames) == 2
+    assert b'"text":"Hel"' in text_frames[0]
+    assert b'"text":"lo"' in text_frames[1]
+    assert frames[-1] == b'event: message_stop\ndata: {"type":"message_stop"}\n\n'
+
+
+async def test_parallel_tool_calls_keep_their_own_blocks():
+    async def stream():
+        yield make_chunk(tool_calls=[make_tool_call(0, id="call_a", name="lookup", arguments='{"q": ')])
+        yield make_chunk(tool_calls=[make_tool_call(1, id="call_b", name="fetch", arguments='{"url": "x"}')])
+        yield make_chunk(tool_calls=[make_tool_call(0, arguments='"a"}')])
+        yield make_chunk(finish_reason="tool_calls")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    starts = {
+        e["index"]: e["content_block"]["id"] for e in events
+        if e.get("type") == "content_block_start"
+    }
+    args = {}
+    for e in events:
+        if e.get("type") == "content_block_delta" and e["delta"]["type"] == "input_json_delta":
+            args[e["index"]] = args.get(e["index"], "") + e["delta"]["partial_json"]
+    assert {starts[i]: a for i, a in args.items()} == {"call_a": '{"q": "a"}', "call_b": '{"url": "x"}'}
+    stops = [e["index"] for e in events if e.get("type") == "content_block_stop"]
+    assert sorted(stops) == sorted(starts)
+
+
+def test_thinking_tags_split_from_content():
+    from backend.app.converters.openai_response_convert import _handle_thinking_from_streaming_content as split
+
+    assert split("plain text", False) == ("plain text", None, False)
+    assert split("a<think>plan</think>b", False) == ("ab", "plan", False)
+    assert split("◁think▷start", False) == ("", "start", True)
+    assert split("more", True) == ("", "more", True)
+    assert split("end\n【/Thinking】answer", True) == ("answer", "end", False)
+
+
+async def test_thinking_tags_split_across_deltas():
+    async def stream():
+        for piece in ("<thi", "nking>plan", "ned</thin", "king>Answer <", "3"):
+            yield make_chunk(content=piece)
+        yield make_chunk(finish_reason="stop")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    thinking = "".join(
+        e["delta"]["thinking"] for e in events
+        if e.get("type") == "content_block_delta" and e["delta"]["type"] == "thinking_delta"
+    )
+    assert thinking == "planned"
+    assert "".join(text_deltas(events)) == "Answer <3"
+
+
+async def test_held_back_text_flushed_when_stream_ends_without_finish_reason():
+    async def stream():
+        yield make_chunk(content="a <")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    assert "".join(text_deltas(events)) == "a <"
+
+
+async def test_held_back_text_starts_text_block_when_none_started():
+    async def stream():
+        yield make_chunk(content="<")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    starts = [e for e in events if e["type"] == "content_block_start"]
+    assert [(e["index"], e["content_block"]["type"]) for e in starts] == [(0, "text")]
+    assert text_deltas(events) == ["<"]
+    assert [e["index"] for e in events if e["type"] == "content_block_stop"] == [0]
+
+
+async def test_held_back_text_after_thinking_closes_thinking_first():
+    async def stream():
+        yield make_chunk(content="<think>plan</think>")
+        yield make_chunk(content="<")
+
+    events = await collect(to_anthropic_async(stream(), "claude-test"))
+    blocks = [(e["type"], e.get("index")) for e in events
+              if e["type"] in ("content_block_start", "content_block_stop")]
+    assert blocks == [
+        ("content_block_start", 0),
+        ("content_block_stop", 0),
+        ("content_block_start", 1),
+        ("content_block_stop", 1),
+    ]
+    assert text_deltas(events) == ["<"]
+
+
+def test_delta_frames_match_generic_sse_encoding():
+    from backend.app.converters import openai_response_convert as conv
+    from backend.app.utils.sse import encode_sse_event
+
+    for value in ("plain", 'quote " and \\ slash', "换行\n✓", ""):
+        assert conv._DELTA_FRAME_TEXT(3, value) == encode_sse_event(conv._text_delta(3, value))
+        assert conv._DELTA_FRAME_THINKING(1, value) == encode_sse_event(conv._thinking_delta(1, value))
+        assert conv._DELTA_FRAME_INPUT_JSON(12, value) == encode_sse_event(conv._input_json_delta(12, value))